@@ -9,6 +9,8 @@ Detects trading opportunities including:
 
 import logging
 import uuid
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional
@@ -108,9 +110,11 @@ class ArbEngine:
         self._recent_opportunities: dict[str, Opportunity] = {}
         self._opportunity_cooldown: dict[str, datetime] = {}
         
-        # Track active opportunities for duration measurement
+        # Track active opportunities for duration measurement, indexed by
+        # market so each book update only checks that market's opportunities
         self._active_opportunities: dict[str, OpportunityTiming] = {}
-        self._opportunity_history: list[OpportunityTiming] = []
+        self._active_by_market: dict[str, set[str]] = {}
+        self._opportunity_history: deque[OpportunityTiming] = deque(maxlen=1000)
         
         logger.info(f"ArbEngine initialized with min_edge={config.min_edge}, min_spread={config.min_spread}")
     
@@ -143,12 +147,15 @@ class ArbEngine:
     
     def _check_expired_opportunities(self, market_id: str, order_book: OrderBook) -> None:
         """Check if any tracked opportunities have expired (prices moved away)."""
+        keys = self._active_by_market.get(market_id)
+        if not keys:
+            return
+        
         now = datetime.utcnow()
         expired_keys = []
         
-        for key, timing in self._active_opportunities.items():
-            if timing.market_id != market_id:
-                continue
+        for key in keys:
+            timing = self._active_opportunities[key]
             
             # Check if opportunity still exists
             still_valid = False
@@ -178,20 +185,24 @@ class ArbEngine:
                 expired_keys.append(key)
         
         for key in expired_keys:
-            del self._active_opportunities[key]
+            self._stop_tracking(key)
+    
+    def _stop_tracking(self, key: str) -> None:
+        """Remove an opportunity from the active set and its market index."""
+        timing = self._active_opportunities.pop(key)
+        keys = self._active_by_market[timing.market_id]
+        keys.discard(key)
+        if not keys:
+            del self._active_by_market[timing.market_id]
     
     def _record_opportunity_duration(self, timing: OpportunityTiming) -> None:
         """Record the duration of an expired opportunity and update stats."""
         if timing.duration_ms is None:
             return
         
-        self._opportunity_history.append(timing)
+        self._opportunity_history.append(timing)  # bounded, keeps the last 1000
         
-        # Keep only last 1000 opportunities
-        if len(self._opportunity_history) > 1000:
-            self._opportunity_history = self._opportunity_history[-500:]
-        
-        # Update stats
+        # Update stats (running aggregates, O(1) per opportunity)
         self.stats.total_opportunities_tracked += 1
         
         # Update min/max
@@ -237,6 +248,7 @@ class ArbEngine:
             edge=opportunity.edge,
         )
         self._active_opportunities[key] = timing
+        self._active_by_market.setdefault(opportunity.market_id, set()).add(key)
     
     def mark_opportunity_executed(self, market_id: str, opportunity_type: str) -> None:
         """Mark an opportunity as executed (for accurate tracking)."""
@@ -245,11 +257,12 @@ class ArbEngine:
             timing = self._active_opportunities[key]
             timing.mark_expired(executed=True)
             self._record_opportunity_duration(timing)
-            del self._active_opportunities[key]
+            self._stop_tracking(key)
     
     def get_timing_stats(self) -> dict:
         """Get opportunity timing statistics for dashboard."""
-        recent_history = self._opportunity_history[-100:] if self._opportunity_history else []
+        # Aggregates are maintained incrementally; only the display tail is copied
+        recent_history = list(islice(reversed(self._opportunity_history), 20))[::-1]
         
         return {
             "total_tracked": self.stats.total_opportunities_tracked,
@@ -269,7 +282,7 @@ class ArbEngine:
                     "executed": t.was_executed,
                     "time": t.detected_at.isoformat(),
                 }
-                for t in recent_history[-20:]
+                for t in recent_history
             ]
         }
     
@@ -295,6 +308,11 @@ class ArbEngine:
         total_ask = best_ask_yes + best_ask_no
         total_bid = best_bid_yes + best_bid_no
         
+        # Fees and gas only shrink the edge, so most ticks can stop here
+        min_edge = self.config.min_edge
+        if 1.0 - total_ask < min_edge and total_bid - 1.0 < min_edge:
+            return None
+        
         # Calculate total fees for 2 orders (buy YES + buy NO, or sell both)
         # Fee is percentage of notional, applied to each leg
         taker_fee_pct = self.config.taker_fee_bps / 10000  # Convert bps to decimal
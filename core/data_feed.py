@@ -7,10 +7,10 @@ class DataFeed:
         self.config = config
         self.portfolio = {"poly": [], "kalshi": []}
 
-    def update_portfolios(self):
+    async def update_portfolios(self):
         """Обновление данных о позициях с учетом новых эндпоинтов"""
         # Polymarket
-        poly_pos = self.poly.get_positions()
+        poly_pos = await self.poly.get_positions()
         if poly_pos is not None:
             # Приводим к единому формату: [{'asset_id': '...', 'size': 10}, ...]
             self.portfolio["poly"] = [
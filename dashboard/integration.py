@@ -165,10 +165,7 @@ class DashboardIntegration:
     
     async def _broadcast_update(self) -> None:
         """Broadcast update to connected clients."""
-        await dashboard_state.broadcast({
-            "type": "update",
-            "data": dashboard_state.to_dict()
-        })
+        await dashboard_state.broadcast_state()
     
     def add_opportunity(
         self,
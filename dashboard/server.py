@@ -6,33 +6,118 @@ FastAPI-based web server for the trading dashboard.
 """
 
 import asyncio
+import gzip
+import hashlib
+import heapq
 import os
 import hmac
-import json
 import logging
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, HTTPException, status
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+import orjson
 from starlette.middleware.base import BaseHTTPMiddleware
 
+try:
+    import msgpack  # Optional: binary WebSocket frames for clients that ask for them
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli  # Optional: brotli-compressed static assets
+except ImportError:
+    brotli = None
+
 logger = logging.getLogger(__name__)
 
 # ---- Security configuration (all optional) ----
 DASHBOARD_TOKEN = os.getenv("DASHBOARD_TOKEN")  # if set, all endpoints require this token
+_DASHBOARD_TOKEN_BYTES = DASHBOARD_TOKEN.encode("utf-8") if DASHBOARD_TOKEN else None
 # Comma-separated allowed origins for WebSocket connections (exact match).
 DASHBOARD_ALLOWED_ORIGINS = [o.strip() for o in os.getenv("DASHBOARD_ALLOWED_ORIGINS", "http://localhost,http://127.0.0.1").split(",") if o.strip()]
 DASHBOARD_MAX_WS_CONNECTIONS = int(os.getenv("DASHBOARD_MAX_WS_CONNECTIONS", "50"))
 DASHBOARD_MAX_WS_MESSAGE_BYTES = int(os.getenv("DASHBOARD_MAX_WS_MESSAGE_BYTES", "32768"))  # 32KB
 
-def _constant_time_equals(a: str, b: str) -> bool:
-    try:
-        return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
-    except Exception:
+# ---- Broadcast batching ----
+BROADCAST_BATCH_WINDOW = 0.02  # seconds to wait for more messages before sending a frame
+BROADCAST_MAX_BATCH = 128  # max messages coalesced into one frame
+WS_SEND_TIMEOUT = 2.0  # seconds before a client that is not reading is dropped
+WS_SEND_QUEUE_SIZE = 8  # frames buffered per client before it is dropped
+WS_HEARTBEAT_INTERVAL = 30.0  # seconds between heartbeats sent to all clients
+WS_GZIP_MIN_BYTES = 1024  # smaller frames go out uncompressed even to gzip clients
+WS_RESUME_FRAMES = 300  # broadcast frames kept for clients that reconnect
+WS_RESUME_GRACE = 60.0  # seconds frames keep being buffered after the last client leaves
+
+# ---- Static assets ----
+STATIC_DIR = Path(__file__).parent / "static"
+STATIC_ASSET_MAX_AGE = 31536000  # hashed URLs never change content
+
+# ---- /api/state caching ----
+STATE_SNAPSHOT_TTL = 1.0  # seconds a serialized state snapshot is reused
+
+# ---- Matched pairs shown in the opportunities feed ----
+MATCHED_PAIRS_TOP = 20  # best matches kept in cross_platform["matched_pairs_top"]
+MATCHED_PAIRS_MIN_SIMILARITY = 0.6  # weaker matches are not shown in the feed
+
+def _json_default(obj):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes with orjson (non-str keys coerced like json.dumps)."""
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _with_seq(frame: bytes, seq: Optional[int]) -> bytes:
+    """Add a top-level "seq" key to a serialized JSON object frame."""
+    if seq is None:
+        return frame
+    return b'{"seq":' + str(seq).encode() + b"," + frame[1:]
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content) -> bytes:
+        return _dumps(content)
+
+
+def _constant_time_equals(a: str, b_bytes: bytes) -> bool:
+    # Tokens come from latin-1 headers or percent-decoded query strings,
+    # so encoding cannot fail; the expected side is encoded once at import
+    return hmac.compare_digest(a.encode("utf-8"), b_bytes)
+
+_now_stamp_cache: tuple[int, str, int] = (-1, "", 0)
+
+def _now_stamp() -> tuple[str, int]:
+    """UTC now as (ISO string, epoch milliseconds), rebuilt at most once per millisecond.
+    
+    The epoch form lets the dashboard format times without parsing the ISO string.
+    """
+    global _now_stamp_cache
+    ms = time.monotonic_ns() // 1_000_000
+    if ms != _now_stamp_cache[0]:
+        _now_stamp_cache = (ms, datetime.utcnow().isoformat(), time.time_ns() // 1_000_000)
+    return _now_stamp_cache[1], _now_stamp_cache[2]
+
+def _utf8_len_exceeds(text: str, limit: int) -> bool:
+    # A character takes 1-4 UTF-8 bytes, so only borderline lengths are encoded
+    if len(text) > limit:
+        return True
+    if len(text) * 4 <= limit:
         return False
+    return len(text.encode("utf-8")) > limit
 
 def _extract_bearer_token(auth_header: str | None) -> str | None:
     if not auth_header:
@@ -44,16 +129,30 @@ def _extract_bearer_token(auth_header: str | None) -> str | None:
 
 
 
+# Attributes that appear in to_dict(); assigning one marks it dirty
+_STATE_SECTIONS = frozenset({
+    "markets", "opportunities", "signals", "orders", "trades", "portfolio",
+    "risk", "stats", "timing", "operational", "cross_platform",
+    "is_running", "mode", "last_update", "started_at",
+})
+# Sections re-checked on every periodic update regardless: uptime is derived,
+# and cross_platform is mutated in place by the cross-platform scanner
+_ALWAYS_DIFFED = frozenset({"uptime_seconds", "cross_platform"})
+
 
 class DashboardState:
     """Holds the current state for the dashboard."""
     
     def __init__(self):
+        # Sections changed since the last periodic update (see __setattr__)
+        self._dirty: set[str] = set()
+        
         self.markets: dict = {}
-        self.opportunities: list = []
-        self.signals: list = []
+        # Histories are capped at insertion; _dumps serializes deques as lists
+        self.opportunities: deque = deque(maxlen=50)
+        self.signals: deque = deque(maxlen=50)
         self.orders: list = []
-        self.trades: list = []
+        self.trades: deque = deque(maxlen=100)
         self.portfolio: dict = {}
         self.risk: dict = {}
         self.stats: dict = {}
@@ -63,6 +162,7 @@ class DashboardState:
         self.mode: str = "dry_run"
         self.last_update: datetime = datetime.utcnow()
         self.started_at: datetime = datetime.utcnow()
+        self._started_monotonic = time.monotonic()  # uptime without wall-clock reads
         
         # Cross-platform (Polymarket + Kalshi)
         self.cross_platform: dict = {
@@ -71,8 +171,9 @@ class DashboardState:
             "polymarket_markets": 0,
             "matched_pairs": 0,
             "kalshi_orderbooks": 0,  # Number of Kalshi orderbooks fetched
-            "cross_opportunities": [],
+            "cross_opportunities": deque(maxlen=50),
             "matched_pairs_data": [],  # Detailed data for display
+            "matched_pairs_top": [],  # Best matches for the feed, see set_matched_pairs()
             "matching_progress": 0,  # Percentage of matching complete
             "matching_checked": 0,  # Number of comparisons done
             "matching_total": 0,  # Total comparisons to do
@@ -80,17 +181,53 @@ class DashboardState:
         }
         
         # WebSocket connections
-        self._connections: list[WebSocket] = []
+        self._connections: set[WebSocket] = set()
+        self._binary_connections: set[WebSocket] = set()  # receive MessagePack frames
+        self._gzip_connections: set[WebSocket] = set()  # receive gzipped large frames
+        # Per-client bounded frame queue and the task that drains it
+        self._writers: dict[WebSocket, tuple[asyncio.Queue, asyncio.Task]] = {}
+        
+        # Outgoing messages, drained in bursts by the broadcaster task
+        self._outbox: Optional[asyncio.Queue] = None
+        self._broadcaster_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        
+        # Per-section JSON of the last periodic broadcast, used to send patches
+        self._last_broadcast: Optional[dict] = None
+        
+        # Broadcast frames are numbered so a reconnecting client can be sent
+        # just the ones it missed. Each entry is one frame's (type, JSON) batch;
+        # clients that saw a frame older than _resume_floor cannot resume.
+        self.session_id = secrets.token_hex(8)
+        self._seq = 0
+        self._replay: deque = deque(maxlen=WS_RESUME_FRAMES)
+        self._resume_floor = 0
+        self._last_disconnect = float("-inf")
+        
+        # Serialized state (without uptime) and its ETag, shared by /api/state
+        # and the WebSocket initial message
+        self._snapshot: Optional[tuple[bytes, str]] = None
+        self._snapshot_at: float = 0.0
+        self._snapshot_update: Optional[datetime] = None
+    
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        if name in _STATE_SECTIONS:
+            self._dirty.add(name)
+    
+    def mark_dirty(self, *sections: str) -> None:
+        """Flag sections mutated in place so the next update re-checks them."""
+        self._dirty.update(sections)
     
     def to_dict(self) -> dict:
         """Convert state to dictionary for JSON serialization."""
-        uptime = (datetime.utcnow() - self.started_at).total_seconds()
+        uptime = time.monotonic() - self._started_monotonic
         return {
             "markets": self.markets,
-            "opportunities": self.opportunities[-50:],  # Last 50
-            "signals": self.signals[-50:],
+            "opportunities": self.opportunities,
+            "signals": self.signals,
             "orders": self.orders,
-            "trades": self.trades[-100:],  # Last 100
+            "trades": self.trades,
             "portfolio": self.portfolio,
             "risk": self.risk,
             "stats": self.stats,
@@ -104,50 +241,364 @@ class DashboardState:
             "uptime_seconds": uptime,
         }
     
+    def state_snapshot(self) -> tuple[bytes, str]:
+        """Return the JSON body for /api/state and its weak ETag.
+        
+        The ETag covers everything except `uptime_seconds`, which changes on
+        every call, so an idle bot answers polls with 304. The serialized
+        state is reused until `last_update` moves, and for at most
+        STATE_SNAPSHOT_TTL seconds to pick up direct mutations.
+        """
+        now = time.monotonic()
+        if (
+            self._snapshot is None
+            or self._snapshot_update != self.last_update
+            or now - self._snapshot_at >= STATE_SNAPSHOT_TTL
+        ):
+            state = self.to_dict()
+            del state["uptime_seconds"]
+            core = _dumps(state)
+            etag = f'W/"{hashlib.blake2b(core, digest_size=8).hexdigest()}"'
+            self._snapshot = (core, etag)
+            self._snapshot_at = now
+            self._snapshot_update = self.last_update
+        
+        core, etag = self._snapshot
+        uptime = time.monotonic() - self._started_monotonic
+        return core[:-1] + b',"uptime_seconds":' + _dumps(uptime) + b"}", etag
+    
     async def broadcast(self, data: dict) -> None:
-        """Broadcast update to all connected WebSocket clients."""
-        if not self._connections:
+        """Queue an update for delivery to all connected WebSocket clients.
+        
+        Messages queued within BROADCAST_BATCH_WINDOW are coalesced into a
+        single frame by the broadcaster task. The message is serialized here,
+        since state dicts can point at live lists that change before the
+        batch goes out.
+        """
+        if not self._has_audience():
             return
         
-        message = json.dumps(data)
-        disconnected = []
+        if self._broadcaster_task is None or self._broadcaster_task.done():
+            self._outbox = asyncio.Queue()
+            self._broadcaster_task = asyncio.create_task(self._broadcaster())
         
-        for ws in self._connections:
+        self._outbox.put_nowait((data.get("type"), _dumps(data)))
+    
+    async def _broadcaster(self) -> None:
+        """Drain the outbox and send each burst of messages as one frame."""
+        while True:
+            batch = [await self._outbox.get()]
+            await asyncio.sleep(BROADCAST_BATCH_WINDOW)
+            while not self._outbox.empty() and len(batch) < BROADCAST_MAX_BATCH:
+                batch.append(self._outbox.get_nowait())
+            
             try:
-                await ws.send_text(message)
-            except Exception:
-                disconnected.append(ws)
+                self._seq += 1
+                self._replay.append(batch)
+                self._send_all(self._coalesce(batch, self._seq))
+            except Exception as e:
+                logger.error(f"Broadcast error: {e}")
+    
+    def _has_audience(self) -> bool:
+        """Whether broadcasts are worth building.
+        
+        True while clients are connected, and for WS_RESUME_GRACE seconds
+        after the last one leaves so it can resume. Once a broadcast is
+        skipped, frames sent before it can no longer be resumed from.
+        """
+        if self._connections or time.monotonic() - self._last_disconnect < WS_RESUME_GRACE:
+            return True
+        self._resume_floor = self._seq + 1
+        return False
+    
+    def start_heartbeat(self) -> None:
+        """Start the shared heartbeat task if it is not already running."""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+    
+    async def _heartbeat(self) -> None:
+        """Send a heartbeat to every client on one shared timer.
+        
+        Exits once the last client has gone; the next connection restarts it.
+        """
+        frame = _dumps({"type": "heartbeat"})
+        while self._connections:
+            await asyncio.sleep(WS_HEARTBEAT_INTERVAL)
+            self._send_all(frame)
+    
+    async def broadcast_state(self) -> None:
+        """Broadcast the periodic state update.
+        
+        The first update after a client connects carries the full state;
+        later ones are patches containing only the values that changed.
+        """
+        if not self._has_audience():
+            self._last_broadcast = None
+            return
         
-        for ws in disconnected:
-            self._connections.remove(ws)
+        message = self._next_state_message()
+        if message is not None:
+            await self.broadcast(message)
+    
+    def reset_state_patches(self) -> None:
+        """Make the next periodic update a full snapshot."""
+        self._last_broadcast = None
+    
+    def _next_state_message(self) -> Optional[dict]:
+        """Build a full `update` or a `patch` against the last broadcast.
+        
+        Only sections assigned (or marked dirty) since the last update are
+        re-serialized and diffed; the rest keep their previous fingerprint.
+        """
+        state = self.to_dict()
+        dirty, self._dirty = self._dirty, set()
+        previous = self._last_broadcast
+        
+        if previous is None:
+            self._last_broadcast = {key: self._fingerprint(value) for key, value in state.items()}
+            return {"type": "update", "data": state}
+        
+        current = {
+            key: self._fingerprint(state[key])
+            for key in (dirty | _ALWAYS_DIFFED) & state.keys()
+        }
+        self._last_broadcast = {**previous, **current}
+        
+        ops = self._diff({key: previous.get(key) for key in current}, current, state)
+        if not ops:
+            return None
+        return {"type": "patch", "ops": ops}
+    
+    @staticmethod
+    def _fingerprint(value):
+        """Serialize a section, one entry at a time for dict sections."""
+        if isinstance(value, dict):
+            return {k: _dumps(v) for k, v in value.items()}
+        return _dumps(value)
+    
+    @staticmethod
+    def _diff(previous: dict, current: dict, state: dict) -> list[dict]:
+        """Diff two fingerprints into JSON-Patch style replace/remove ops.
+        
+        Dict sections are compared one level deep so a single changed market
+        or stat does not resend the whole section.
+        """
+        def pointer(*parts: str) -> str:
+            return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+        
+        ops = []
+        for key, value in current.items():
+            old = previous.get(key)
+            if isinstance(value, dict) and isinstance(old, dict):
+                for sub, encoded in value.items():
+                    if old.get(sub) != encoded:
+                        ops.append({"op": "replace", "path": pointer(key, sub), "value": state[key][sub]})
+                for sub in old.keys() - value.keys():
+                    ops.append({"op": "remove", "path": pointer(key, sub)})
+            elif old != value:
+                ops.append({"op": "replace", "path": pointer(key), "value": state[key]})
+        
+        for key in previous.keys() - current.keys():
+            ops.append({"op": "remove", "path": pointer(key)})
+        return ops
+    
+    @staticmethod
+    def _coalesce(batch: list[tuple[str, bytes]], seq: Optional[int] = None) -> bytes:
+        """Collapse a burst of (type, JSON) messages into a single frame.
+        
+        A full-state update supersedes every update and patch queued before
+        it, so only the last one and anything after it are kept. With `seq`,
+        the frame carries it as a top-level "seq" key.
+        """
+        if len(batch) == 1:
+            return _with_seq(batch[0][1], seq)
+        
+        last_update = max(
+            (i for i, (kind, _) in enumerate(batch) if kind == "update"),
+            default=-1,
+        )
+        items = [
+            frame for i, (kind, frame) in enumerate(batch)
+            if i >= last_update or kind not in ("update", "patch")
+        ]
+        if len(items) == 1:
+            return _with_seq(items[0], seq)
+        return _with_seq(b'{"type":"batch","items":[' + b",".join(items) + b"]}", seq)
+    
+    def resume(self, websocket: WebSocket, session: Optional[str], since: Optional[str]) -> bool:
+        """Queue the frames a reconnecting client missed since frame `since`.
+        
+        Returns False when the client must start over from a full snapshot:
+        it saw another server process, it is further behind than the replay
+        buffer reaches, or a broadcast was skipped while it was away.
+        """
+        if session != self.session_id or since is None:
+            return False
+        try:
+            seen = int(since)
+        except ValueError:
+            return False
+        missed = self._seq - seen
+        if seen < self._resume_floor or not 0 <= missed <= len(self._replay):
+            return False
+        if missed:
+            batches = list(self._replay)[len(self._replay) - missed:]
+            frame = self._coalesce([message for batch in batches for message in batch], self._seq)
+            self._enqueue(websocket, self._encode(frame, websocket))
+        return True
+    
+    def enable_binary(self, websocket: WebSocket) -> bool:
+        """Send MessagePack frames to `websocket` if msgpack is available."""
+        if msgpack is None:
+            return False
+        self._binary_connections.add(websocket)
+        return True
+    
+    def enable_gzip(self, websocket: WebSocket) -> None:
+        """Gzip frames of WS_GZIP_MIN_BYTES or more for `websocket`."""
+        self._gzip_connections.add(websocket)
+    
+    def disconnect(self, websocket: WebSocket) -> None:
+        """Forget a closed WebSocket connection and stop its writer."""
+        if websocket in self._connections:
+            self._connections.discard(websocket)
+            self._last_disconnect = time.monotonic()
+        self._binary_connections.discard(websocket)
+        self._gzip_connections.discard(websocket)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None:
+            # Wake an idle writer; a busy one exits after its current send
+            try:
+                writer[0].put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+    
+    def send(self, websocket: WebSocket, payload: dict) -> None:
+        """Queue a single payload for one client in its negotiated format."""
+        frame = _dumps(payload)
+        if websocket in self._binary_connections:
+            # Round-trip through JSON so deques and other orjson-only types
+            # pack the same way they serialize for JSON clients
+            frame = msgpack.packb(orjson.loads(frame), use_bin_type=True)
+        self._enqueue(websocket, self._compress(frame, websocket in self._gzip_connections))
+    
+    def send_initial(self, websocket: WebSocket) -> None:
+        """Queue the full state for a newly connected client.
+        
+        JSON clients get the cached /api/state snapshot wrapped in place.
+        """
+        if websocket in self._binary_connections:
+            self.send(websocket, {
+                "type": "initial", "session": self.session_id, "seq": self._seq, "data": self.to_dict(),
+            })
+            return
+        body, _ = self.state_snapshot()
+        frame = (
+            b'{"type":"initial","session":"' + self.session_id.encode() + b'","seq":'
+            + str(self._seq).encode() + b',"data":' + body + b"}"
+        )
+        self._enqueue(websocket, self._compress(frame, websocket in self._gzip_connections))
+    
+    def _send_all(self, frame: bytes) -> None:
+        """Queue a serialized JSON frame for every connected client.
+        
+        JSON clients get the orjson bytes as they are; MessagePack clients get
+        the frame re-encoded. Each (format, gzip) variant is built at most
+        once, so compression is paid per broadcast rather than per client.
+        Queuing never waits on a socket; a client whose queue is already full
+        is dropped.
+        """
+        variants: dict[tuple[bool, bool], bytes] = {}
+        for ws in tuple(self._connections):
+            key = (ws in self._binary_connections, ws in self._gzip_connections)
+            out = variants.get(key)
+            if out is None:
+                out = variants[key] = self._encode(frame, ws)
+            self._enqueue(ws, out)
+    
+    def _encode(self, frame: bytes, websocket: WebSocket) -> bytes:
+        """Convert a serialized JSON frame to the client's negotiated format."""
+        if websocket in self._binary_connections:
+            frame = msgpack.packb(orjson.loads(frame), use_bin_type=True)
+        return self._compress(frame, websocket in self._gzip_connections)
+    
+    @staticmethod
+    def _compress(frame: bytes, enabled: bool) -> bytes:
+        """Gzip a frame for clients that asked for it, if it is worth it."""
+        if enabled and len(frame) >= WS_GZIP_MIN_BYTES:
+            return gzip.compress(frame, compresslevel=1, mtime=0)
+        return frame
+    
+    def _enqueue(self, websocket: WebSocket, frame: bytes) -> None:
+        """Hand a frame to the client's writer, dropping it if backlogged."""
+        writer = self._writers.get(websocket)
+        if writer is None:
+            queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+            writer = (queue, asyncio.create_task(self._writer(websocket, queue)))
+            self._writers[websocket] = writer
+        try:
+            writer[0].put_nowait(frame)
+        except asyncio.QueueFull:
+            logger.warning("Dropping WebSocket client that is not keeping up")
+            self._drop(websocket)
+    
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue) -> None:
+        """Send queued frames to one client, in order.
+        
+        This is the only task that writes to the socket. A send that fails or
+        takes longer than WS_SEND_TIMEOUT drops the client. The writer stops
+        on a None frame or once the client has been disconnected, rather than
+        by cancellation, which wait_for can swallow.
+        """
+        while websocket in self._writers:
+            frame = await queue.get()
+            if frame is None:
+                return
+            try:
+                # Binary frames skip the str round trip: orjson output is
+                # already UTF-8 and goes on the wire as is
+                await asyncio.wait_for(websocket.send_bytes(frame), WS_SEND_TIMEOUT)
+            except Exception:
+                self._drop(websocket)
+                return
+            finally:
+                queue.task_done()  # lets queue.join() wait for frames to be sent
+    
+    def _drop(self, websocket: WebSocket) -> None:
+        """Disconnect a client after a failed send and close its socket."""
+        self.disconnect(websocket)
+        asyncio.create_task(self._close_quietly(websocket))
+    
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
+        """Close a socket, ignoring errors from peers that are already gone."""
+        try:
+            await websocket.close(code=1011)
+        except Exception:
+            pass
     
     def add_opportunity(self, opportunity: dict) -> None:
         """Add a new opportunity."""
-        opportunity["timestamp"] = datetime.utcnow().isoformat()
+        opportunity["timestamp"], opportunity["timestamp_ms"] = _now_stamp()
         self.opportunities.append(opportunity)
-        if len(self.opportunities) > 200:
-            self.opportunities = self.opportunities[-100:]
+        self._dirty.add("opportunities")
     
     def add_signal(self, signal: dict) -> None:
         """Add a new signal."""
-        signal["timestamp"] = datetime.utcnow().isoformat()
+        signal["timestamp"], signal["timestamp_ms"] = _now_stamp()
         self.signals.append(signal)
-        if len(self.signals) > 200:
-            self.signals = self.signals[-100:]
+        self._dirty.add("signals")
     
     def add_trade(self, trade: dict) -> None:
         """Add a new trade."""
-        trade["timestamp"] = datetime.utcnow().isoformat()
+        trade["timestamp"], trade["timestamp_ms"] = _now_stamp()
         self.trades.append(trade)
-        if len(self.trades) > 500:
-            self.trades = self.trades[-250:]
+        self._dirty.add("trades")
     
     def add_cross_platform_opportunity(self, opportunity: dict) -> None:
         """Add a cross-platform arbitrage opportunity."""
-        opportunity["timestamp"] = datetime.utcnow().isoformat()
+        opportunity["timestamp"], opportunity["timestamp_ms"] = _now_stamp()
         self.cross_platform["cross_opportunities"].append(opportunity)
-        if len(self.cross_platform["cross_opportunities"]) > 100:
-            self.cross_platform["cross_opportunities"] = self.cross_platform["cross_opportunities"][-50:]
     
     def update_cross_platform_stats(
         self,
@@ -163,44 +614,82 @@ class DashboardState:
         self.cross_platform["polymarket_markets"] = polymarket_markets
         self.cross_platform["matched_pairs"] = matched_pairs
         if matched_pairs_data is not None:
-            self.cross_platform["matched_pairs_data"] = matched_pairs_data
+            self.set_matched_pairs(matched_pairs_data)
+    
+    def set_matched_pairs(self, pairs: list) -> None:
+        """Replace the matched pairs and reselect the feed's best matches.
+        
+        The selection only changes when the pairs do, so it is made here
+        rather than by every browser on every update.
+        """
+        self.cross_platform["matched_pairs_data"] = pairs
+        self.cross_platform["matched_pairs_top"] = heapq.nlargest(
+            MATCHED_PAIRS_TOP,
+            (p for p in pairs if (p.get("similarity") or 0) >= MATCHED_PAIRS_MIN_SIMILARITY),
+            key=lambda p: p.get("similarity") or 0,
+        )
 
 
 # Global state
 dashboard_state = DashboardState()
 
 
+# ---- Inbound WebSocket messages ----
+_PING_TEXT = '{"type":"ping"}'
+
+
+def _handle_ping(websocket: WebSocket, msg: Optional[dict]) -> None:
+    dashboard_state.send(websocket, {"type": "pong"})
+
+
+# Client message type -> handler(websocket, message)
+_WS_HANDLERS = {
+    "ping": _handle_ping,
+}
+
+
+# Pre-encoded in ASGI raw-header form so each response takes one list extend.
+# The dashboard script is external, but the markup still carries inline style
+# attributes, so only style-src allows unsafe-inline.
+_SEC_HEADERS_RAW: list[tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+    (
+        b"content-security-policy",
+        b"default-src 'self'; "
+        b"img-src 'self' data:; "
+        b"style-src 'self' 'unsafe-inline'; "
+        b"script-src 'self'; "
+        b"connect-src 'self' ws: wss:; "
+        b"object-src 'none'; "
+        b"base-uri 'self'; "
+        b"frame-ancestors 'none'",
+    ),
+]
+
+
 class SecurityHeadersAndAuthMiddleware(BaseHTTPMiddleware):
     """Adds basic security headers and (optionally) requires a bearer/query token."""
 
     async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+
+        # Health checks are polled by load balancers: no auth, no headers
+        if path == "/health":
+            return await call_next(request)
+
         # Auth (optional)
-        if DASHBOARD_TOKEN:
-            path = request.url.path
-            if not (path.startswith("/static") or path in ("/health",)):
-                token = _extract_bearer_token(request.headers.get("authorization")) or request.query_params.get("token")
-                if not token or not _constant_time_equals(token, DASHBOARD_TOKEN):
-                    return HTMLResponse("Unauthorized", status_code=status.HTTP_401_UNAUTHORIZED)
+        if DASHBOARD_TOKEN and not path.startswith("/static"):
+            token = _extract_bearer_token(request.headers.get("authorization")) or request.query_params.get("token")
+            if not token or not _constant_time_equals(token, _DASHBOARD_TOKEN_BYTES):
+                return HTMLResponse("Unauthorized", status_code=status.HTTP_401_UNAUTHORIZED)
 
         response = await call_next(request)
 
         # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        # Note: dashboard uses inline CSS/JS, so we allow unsafe-inline here. If you externalize scripts/styles,
-        # tighten this CSP.
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "img-src 'self' data:; "
-            "style-src 'self' 'unsafe-inline'; "
-            "script-src 'self' 'unsafe-inline'; "
-            "connect-src 'self' ws: wss:; "
-            "object-src 'none'; "
-            "base-uri 'self'; "
-            "frame-ancestors 'none'"
-        )
+        response.raw_headers.extend(_SEC_HEADERS_RAW)
         return response
 
 
@@ -210,27 +699,39 @@ def create_app() -> FastAPI:
         title="Polymarket Arbitrage Dashboard",
         description="Live monitoring dashboard for the trading bot",
         version="1.0.0",
+        default_response_class=ORJSONResponse,
     )
     app.add_middleware(SecurityHeadersAndAuthMiddleware)
 
+    # Content-hashed, precompressed assets; registered ahead of the mount
+    for asset in _STATIC_ASSETS.values():
+        app.add_api_route(asset.url, _asset_endpoint(asset), include_in_schema=False)
+
     # Static assets (if present)
-    static_dir = Path(__file__).parent / "static"
-    if static_dir.exists():
-        app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    if STATIC_DIR.exists():
+        app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
     @app.get("/health")
     async def health():
         return {"status": "ok"}
 
     @app.get("/", response_class=HTMLResponse)
-    async def index():
-        """Serve the main dashboard page."""
-        return HTMLResponse(get_embedded_html())
+    async def index(request: Request):
+        """Serve the main dashboard page (supports If-None-Match, gzip and brotli)."""
+        headers = {"ETag": _HTML_ETAG, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == _HTML_ETAG:
+            return Response(status_code=304, headers=headers)
+        body = _negotiate_encoding(request, headers, _HTML_BYTES, _HTML_GZIP, _HTML_BR)
+        return Response(body, media_type="text/html; charset=utf-8", headers=headers)
 
     @app.get("/api/state")
-    async def get_state():
-        """Get full dashboard state."""
-        return dashboard_state.to_dict()
+    async def get_state(request: Request):
+        """Get full dashboard state (supports If-None-Match)."""
+        body, etag = dashboard_state.state_snapshot()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
 
     @app.get("/api/markets")
     async def get_markets():
@@ -240,1151 +741,186 @@ def create_app() -> FastAPI:
     @app.get("/api/opportunities")
     async def get_opportunities():
         """Get recent opportunities."""
-        return {"opportunities": dashboard_state.opportunities[-50:]}
+        return {"opportunities": dashboard_state.opportunities}
 
     @app.get("/api/portfolio")
     async def get_portfolio():
         """Get portfolio state."""
         return dashboard_state.portfolio
-
-    @app.get("/api/risk")
-    async def get_risk():
-        """Get risk metrics."""
-        return dashboard_state.risk
-
-    @app.get("/api/timing")
-    async def get_timing():
-        """Get opportunity timing statistics."""
-        return dashboard_state.timing
-
-    @app.websocket("/ws")
-    async def websocket_endpoint(websocket: WebSocket):
-        """WebSocket endpoint for real-time updates."""
-        # Optional Origin allowlist (defends against cross-site WebSocket hijacking)
-        origin = websocket.headers.get("origin")
-        if origin and DASHBOARD_ALLOWED_ORIGINS and origin not in DASHBOARD_ALLOWED_ORIGINS:
-            await websocket.close(code=1008)
-            return
-
-        # Optional token auth
-        if DASHBOARD_TOKEN:
-            token = _extract_bearer_token(websocket.headers.get("authorization")) or websocket.query_params.get("token")
-            if not token or not _constant_time_equals(token, DASHBOARD_TOKEN):
-                await websocket.close(code=1008)
-                return
-
-        # Connection limit (basic DoS protection)
-        if len(dashboard_state._connections) >= DASHBOARD_MAX_WS_CONNECTIONS:
-            await websocket.close(code=1013)  # Try again later
-            return
-
-        await websocket.accept()
-        dashboard_state._connections.append(websocket)
-
-        try:
-            # Send initial state
-            await websocket.send_text(json.dumps({
-                "type": "initial",
-                "data": dashboard_state.to_dict()
-            }))
-
-            # Keep connection alive and receive any commands
-            while True:
-                try:
-                    data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-
-                    # Ignore oversized payloads to avoid memory/CPU abuse
-                    if len(data.encode("utf-8")) > DASHBOARD_MAX_WS_MESSAGE_BYTES:
-                        continue
-
-                    # Simple ping/pong support
-                    try:
-                        msg = json.loads(data)
-                        if isinstance(msg, dict) and msg.get("type") == "ping":
-                            await websocket.send_text(json.dumps({"type": "pong"}))
-                    except Exception:
-                        # Ignore malformed client messages
-                        continue
-
-                except asyncio.TimeoutError:
-                    # Send heartbeat
-                    await websocket.send_text(json.dumps({"type": "heartbeat"}))
-
-        except WebSocketDisconnect:
-            pass
-        except Exception as e:
-            logger.error(f"WebSocket error: {e}")
-        finally:
-            if websocket in dashboard_state._connections:
-                dashboard_state._connections.remove(websocket)
-
-    return app
-
-
-def get_embedded_html() -> str:
-    """Return embedded HTML for the dashboard."""
-    return '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Polymarket Arbitrage Dashboard</title>
-    <style>
-        :root {
-            --bg-primary: #0a0a0f;
-            --bg-secondary: #12121a;
-            --bg-card: #1a1a24;
-            --border-color: #2a2a3a;
-            --text-primary: #e0e0e0;
-            --text-secondary: #888;
-            --accent-green: #00ff88;
-            --accent-red: #ff4466;
-            --accent-blue: #4488ff;
-            --accent-yellow: #ffaa00;
-            --accent-purple: #aa66ff;
-        }
-        
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'JetBrains Mono', 'Fira Code', 'SF Mono', monospace;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            overflow-x: hidden;
-        }
-        
-        .header {
-            background: linear-gradient(135deg, var(--bg-secondary) 0%, var(--bg-card) 100%);
-            border-bottom: 1px solid var(--border-color);
-            padding: 1rem 2rem;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .logo {
-            font-size: 1.5rem;
-            font-weight: 700;
-            background: linear-gradient(135deg, var(--accent-green) 0%, var(--accent-blue) 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-        
-        .status {
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-        }
-        
-        .status-indicator {
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            padding: 0.5rem 1rem;
-            background: var(--bg-card);
-            border-radius: 8px;
-            border: 1px solid var(--border-color);
-        }
-        
-        .status-dot {
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-            animation: pulse 2s infinite;
-        }
-        
-        .status-dot.running {
-            background: var(--accent-green);
-            box-shadow: 0 0 10px var(--accent-green);
-        }
-        
-        .status-dot.stopped {
-            background: var(--accent-red);
-        }
-        
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        
-        .mode-badge {
-            padding: 0.25rem 0.75rem;
-            border-radius: 4px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            text-transform: uppercase;
-        }
-        
-        .mode-badge.dry-run {
-            background: var(--accent-yellow);
-            color: #000;
-        }
-        
-        .mode-badge.live {
-            background: var(--accent-red);
-            color: #fff;
-        }
-        
-        .dashboard {
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            grid-template-rows: auto auto 1fr;
-            gap: 1rem;
-            padding: 1rem;
-            max-width: 1800px;
-            margin: 0 auto;
-        }
-        
-        .card {
-            background: var(--bg-card);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            overflow: hidden;
-        }
-        
-        .card-header {
-            padding: 1rem;
-            border-bottom: 1px solid var(--border-color);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .card-title {
-            font-size: 0.875rem;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            color: var(--text-secondary);
-        }
-        
-        .card-body {
-            padding: 1rem;
-        }
-        
-        /* Metric Cards */
-        .metrics {
-            grid-column: span 4;
-            display: grid;
-            grid-template-columns: repeat(6, 1fr);
-            gap: 1rem;
-        }
-        
-        .metric-card {
-            background: var(--bg-card);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            padding: 1.25rem;
-            text-align: center;
-        }
-        
-        .metric-label {
-            font-size: 0.75rem;
-            color: var(--text-secondary);
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            margin-bottom: 0.5rem;
-        }
-        
-        .metric-value {
-            font-size: 1.75rem;
-            font-weight: 700;
-        }
-        
-        .metric-value.positive {
-            color: var(--accent-green);
-        }
-        
-        .metric-value.negative {
-            color: var(--accent-red);
-        }
-        
-        .metric-value.neutral {
-            color: var(--accent-blue);
-        }
-        
-        .metric-change {
-            font-size: 0.75rem;
-            margin-top: 0.25rem;
-        }
-        
-        /* Opportunities Card */
-        .opportunities-card {
-            grid-column: span 2;
-            grid-row: span 2;
-        }
-        
-        .opportunity-list {
-            max-height: 400px;
-            overflow-y: auto;
-        }
-        
-        .opportunity-item {
-            padding: 0.75rem;
-            border-bottom: 1px solid var(--border-color);
-            display: grid;
-            grid-template-columns: auto 1fr auto;
-            gap: 0.75rem;
-            align-items: center;
-        }
-        
-        .opportunity-item:last-child {
-            border-bottom: none;
-        }
-        
-        .opportunity-type {
-            padding: 0.25rem 0.5rem;
-            border-radius: 4px;
-            font-size: 0.7rem;
-            font-weight: 600;
-            text-transform: uppercase;
-        }
-        
-        .opportunity-type.bundle-long {
-            background: rgba(0, 255, 136, 0.2);
-            color: var(--accent-green);
-        }
-        
-        .opportunity-type.bundle-short {
-            background: rgba(255, 68, 102, 0.2);
-            color: var(--accent-red);
-        }
-        
-        .opportunity-type.mm {
-            background: rgba(68, 136, 255, 0.2);
-            color: var(--accent-blue);
-        }
-        
-        .opportunity-details {
-            font-size: 0.8rem;
-        }
-        
-        .opportunity-market {
-            color: var(--text-primary);
-            margin-bottom: 0.25rem;
-            white-space: nowrap;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            max-width: 250px;
-        }
-        
-        .opportunity-edge {
-            color: var(--accent-green);
-            font-weight: 600;
-        }
-        
-        .opportunity-time {
-            font-size: 0.7rem;
-            color: var(--text-secondary);
-        }
-        
-        /* Portfolio Card */
-        .portfolio-card {
-            grid-column: span 2;
-        }
-        
-        .position-list {
-            max-height: 200px;
-            overflow-y: auto;
-        }
-        
-        .position-item {
-            display: grid;
-            grid-template-columns: 1fr auto auto;
-            gap: 1rem;
-            padding: 0.5rem 0;
-            border-bottom: 1px solid var(--border-color);
-            font-size: 0.85rem;
-        }
-        
-        .position-item:last-child {
-            border-bottom: none;
-        }
-        
-        /* Risk Card */
-        .risk-card {
-            grid-column: span 2;
-        }
-        
-        .risk-bar {
-            height: 8px;
-            background: var(--bg-secondary);
-            border-radius: 4px;
-            overflow: hidden;
-            margin: 0.5rem 0;
-        }
-        
-        .risk-bar-fill {
-            height: 100%;
-            border-radius: 4px;
-            transition: width 0.3s ease;
-        }
-        
-        .risk-bar-fill.safe {
-            background: var(--accent-green);
-        }
-        
-        .risk-bar-fill.warning {
-            background: var(--accent-yellow);
-        }
-        
-        .risk-bar-fill.danger {
-            background: var(--accent-red);
-        }
-        
-        .risk-item {
-            margin-bottom: 1rem;
-        }
-        
-        .risk-label {
-            display: flex;
-            justify-content: space-between;
-            font-size: 0.8rem;
-            margin-bottom: 0.25rem;
-        }
-        
-        /* Activity Feed */
-        .activity-card {
-            grid-column: span 2;
-            grid-row: span 2;
-        }
-        
-        .activity-list {
-            max-height: 400px;
-            overflow-y: auto;
-        }
-        
-        .activity-item {
-            padding: 0.5rem;
-            border-bottom: 1px solid var(--border-color);
-            font-size: 0.8rem;
-            display: flex;
-            gap: 0.75rem;
-            align-items: flex-start;
-        }
-        
-        .activity-icon {
-            width: 24px;
-            height: 24px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 0.7rem;
-            flex-shrink: 0;
-        }
-        
-        .activity-icon.order {
-            background: rgba(68, 136, 255, 0.2);
-            color: var(--accent-blue);
-        }
-        
-        .activity-icon.fill {
-            background: rgba(0, 255, 136, 0.2);
-            color: var(--accent-green);
-        }
-        
-        .activity-icon.cancel {
-            background: rgba(255, 68, 102, 0.2);
-            color: var(--accent-red);
-        }
-        
-        .activity-icon.signal {
-            background: rgba(170, 102, 255, 0.2);
-            color: var(--accent-purple);
-        }
-        
-        .activity-content {
-            flex: 1;
-        }
-        
-        .activity-message {
-            color: var(--text-primary);
-        }
-        
-        .activity-time {
-            color: var(--text-secondary);
-            font-size: 0.7rem;
-        }
-        
-        /* Operational Stats Card */
-        .operational-card {
-            grid-column: span 2;
-        }
-        
-        .op-stats-grid {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 0.75rem;
-        }
-        
-        .op-stat {
-            background: var(--bg-secondary);
-            padding: 1rem;
-            border-radius: 8px;
-            text-align: center;
-        }
-        
-        .op-stat-value {
-            font-size: 1.5rem;
-            font-weight: 700;
-            color: var(--accent-blue);
-        }
-        
-        .op-stat-value.active {
-            color: var(--accent-green);
-        }
-        
-        .op-stat-label {
-            font-size: 0.7rem;
-            color: var(--text-secondary);
-        }
-        
-        /* Cross-Platform Arbitrage Card */
-        .cross-platform-card {
-            grid-column: span 2;
-            border: 1px solid rgba(255, 165, 0, 0.3);
-        }
-        
-        .cross-platform-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .cross-platform-badge {
-            background: linear-gradient(135deg, #ff6b35, #f7931a);
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.7rem;
-            font-weight: 600;
-        }
-        
-        /* Live Opportunities Feed */
-        .opportunities-feed {
-            grid-column: span 2;
-            max-height: 600px;
-            overflow-y: auto;
-        }
-        
-        .opp-card {
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            padding: 1rem;
-            margin-bottom: 0.75rem;
-            border-left: 4px solid var(--accent-green);
-            transition: transform 0.2s, box-shadow 0.2s;
-        }
-        
-        .opp-card:hover {
-            transform: translateX(4px);
-            box-shadow: 0 4px 12px rgba(0, 255, 136, 0.1);
-        }
-        
-        .opp-card.cross-platform {
-            border-left-color: #f7931a;
-        }
-        
-        .opp-card.polymarket {
-            border-left-color: #8b5cf6;
-        }
-        
-        .opp-card.kalshi {
-            border-left-color: #3b82f6;
-        }
-        
-        .opp-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 0.75rem;
-        }
-        
-        .opp-category {
-            display: inline-flex;
-            align-items: center;
-            gap: 0.5rem;
-        }
-        
-        .opp-badge {
-            background: var(--bg-primary);
-            padding: 0.2rem 0.5rem;
-            border-radius: 4px;
-            font-size: 0.65rem;
-            font-weight: 700;
-            text-transform: uppercase;
-        }
-        
-        .opp-badge.nfl { background: #1a472a; color: #4ade80; }
-        .opp-badge.nba { background: #1e3a5f; color: #60a5fa; }
-        .opp-badge.politics { background: #4a1d6a; color: #c084fc; }
-        .opp-badge.crypto { background: #5c4b1a; color: #fbbf24; }
-        .opp-badge.soccer { background: #1a3d3d; color: #2dd4bf; }
-        .opp-badge.cross { background: #5c3d1a; color: #f7931a; }
-        
-        .opp-edge {
-            font-size: 1.1rem;
-            font-weight: 700;
-            color: var(--accent-green);
-        }
-        
-        .opp-title {
-            font-size: 0.95rem;
-            font-weight: 600;
-            color: var(--text-primary);
-            margin-bottom: 0.5rem;
-        }
-        
-        .opp-market-info {
-            font-size: 0.7rem;
-            color: var(--text-muted);
-            margin-bottom: 0.75rem;
-        }
-        
-        .opp-platforms {
-            display: flex;
-            flex-direction: column;
-            gap: 0.5rem;
-        }
-        
-        .opp-platform-row {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            padding: 0.5rem;
-            background: var(--bg-primary);
-            border-radius: 6px;
-        }
-        
-        .opp-platform-name {
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            font-size: 0.8rem;
-            font-weight: 500;
-        }
-        
-        .opp-platform-icon {
-            width: 20px;
-            height: 20px;
-            border-radius: 4px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 0.6rem;
-            font-weight: 700;
-        }
-        
-        .opp-platform-icon.poly { background: #8b5cf6; }
-        .opp-platform-icon.kalshi { background: #f7931a; }
-        
-        .opp-platform-price {
-            font-size: 0.9rem;
-            font-weight: 700;
-        }
-        
-        .opp-platform-price.buy { color: var(--accent-green); }
-        .opp-platform-price.sell { color: #ef4444; }
-        
-        .opp-status {
-            display: flex;
-            align-items: center;
-            gap: 0.25rem;
-            font-size: 0.65rem;
-            color: var(--accent-green);
-        }
-        
-        .opp-status-dot {
-            width: 6px;
-            height: 6px;
-            background: var(--accent-green);
-            border-radius: 50%;
-            animation: pulse 2s infinite;
-        }
-        
-        .no-opportunities {
-            text-align: center;
-            padding: 2rem;
-            color: var(--text-muted);
-        }
-        
-        .platform-stats {
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            gap: 0.75rem;
-            margin-bottom: 1rem;
-        }
-        
-        .platform-stat {
-            background: var(--bg-secondary);
-            padding: 0.75rem;
-            border-radius: 8px;
-            text-align: center;
-        }
-        
-        .platform-stat-value {
-            font-size: 1.25rem;
-            font-weight: 700;
-        }
-        
-        .platform-stat-value.polymarket {
-            color: #8b5cf6;
-        }
-        
-        .platform-stat-value.kalshi {
-            color: #f7931a;
-        }
-        
-        .platform-stat-value.matched {
-            color: var(--accent-green);
-        }
-        
-        .platform-stat-value.cross-opp {
-            color: #ff6b35;
-        }
-        
-        .platform-stat-label {
-            font-size: 0.65rem;
-            color: var(--text-secondary);
-            margin-top: 0.25rem;
-        }
-        
-        .platform-stat-status {
-            font-size: 0.6rem;
-            margin-top: 0.35rem;
-            padding: 0.15rem 0.4rem;
-            border-radius: 4px;
-            background: var(--bg-tertiary);
-        }
-        
-        .platform-stat-status.loading {
-            color: var(--accent-yellow);
-            animation: pulse 1.5s infinite;
-        }
-        
-        .platform-stat-status.ready {
-            color: var(--accent-green);
-        }
-        
-        .platform-stat-status.scanning {
-            color: var(--accent-blue);
-        }
-        
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        
-        .cross-opp-list {
-            max-height: 200px;
-            overflow-y: auto;
-        }
-        
-        .cross-opp-item {
-            display: grid;
-            grid-template-columns: auto 1fr auto auto;
-            gap: 1rem;
-            padding: 0.5rem;
-            border-bottom: 1px solid var(--border-color);
-            align-items: center;
-            font-size: 0.8rem;
-        }
-        
-        .cross-opp-direction {
-            display: flex;
-            flex-direction: column;
-            gap: 0.25rem;
-        }
-        
-        .cross-opp-platform {
-            padding: 0.15rem 0.4rem;
-            border-radius: 4px;
-            font-size: 0.65rem;
-            font-weight: 600;
-        }
-        
-        .cross-opp-platform.buy {
-            background: rgba(0, 255, 136, 0.2);
-            color: var(--accent-green);
-        }
-        
-        .cross-opp-platform.sell {
-            background: rgba(255, 68, 102, 0.2);
-            color: var(--accent-red);
-        }
-        
-        /* Matched Pairs Cards - Like reference design */
-        .matched-pairs-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
-            gap: 1rem;
-            max-height: 400px;
-            overflow-y: auto;
-            padding: 0.5rem;
-        }
-        
-        .pair-card {
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            padding: 1rem;
-            border: 1px solid var(--border-color);
-            transition: all 0.2s ease;
-        }
-        
-        .pair-card:hover {
-            border-color: var(--accent-blue);
-            transform: translateY(-2px);
-        }
-        
-        .pair-card.has-arb {
-            border-color: var(--accent-green);
-            box-shadow: 0 0 20px rgba(0, 255, 136, 0.15);
-        }
-        
-        .pair-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 0.75rem;
-        }
-        
-        .pair-sport-badge {
-            background: linear-gradient(135deg, #4488ff, #2266cc);
-            padding: 0.2rem 0.5rem;
-            border-radius: 6px;
-            font-size: 0.65rem;
-            font-weight: 700;
-            text-transform: uppercase;
-        }
-        
-        .pair-arb-badge {
-            background: linear-gradient(135deg, #00ff88, #00cc66);
-            color: #000;
-            padding: 0.2rem 0.6rem;
-            border-radius: 6px;
-            font-size: 0.65rem;
-            font-weight: 700;
-            display: flex;
-            align-items: center;
-            gap: 0.25rem;
-        }
-        
-        .pair-title {
-            font-weight: 600;
-            font-size: 0.9rem;
-            margin-bottom: 0.75rem;
-            line-height: 1.3;
-            color: var(--text-primary);
-        }
-        
-        .pair-platforms {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 0.75rem;
-        }
-        
-        .platform-box {
-            background: var(--bg-tertiary);
-            border-radius: 8px;
-            padding: 0.6rem;
-            text-align: center;
-        }
-        
-        .platform-name {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 0.4rem;
-            margin-bottom: 0.5rem;
-        }
-        
-        .platform-name .dot {
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-        }
-        
-        .platform-name .dot.polymarket {
-            background: #8b5cf6;
-        }
-        
-        .platform-name .dot.kalshi {
-            background: #f7931a;
-        }
-        
-        .platform-name span {
-            font-size: 0.75rem;
-            font-weight: 600;
-        }
-        
-        .platform-prices {
-            display: flex;
-            justify-content: center;
-            gap: 0.5rem;
-            font-size: 0.85rem;
-        }
-        
-        .platform-prices .yes {
-            color: var(--accent-green);
-            font-weight: 700;
-        }
-        
-        .platform-prices .no {
-            color: var(--accent-red);
-            font-weight: 700;
-        }
-        
-        .platform-prices .divider {
-            color: var(--text-secondary);
-        }
-        
-        .pair-footer {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-top: 0.75rem;
-            padding-top: 0.5rem;
-            border-top: 1px solid var(--border-color);
-            font-size: 0.7rem;
-            color: var(--text-secondary);
-        }
-        
-        .pair-edge {
-            font-weight: 700;
-            font-size: 0.85rem;
-        }
-        
-        .pair-edge.positive {
-            color: var(--accent-green);
-        }
-        
-        .pair-edge.negative {
-            color: var(--text-secondary);
-        }
-        
-        .uptime-display {
-            text-align: center;
-            padding: 1rem;
-            margin-top: 0.75rem;
-            background: var(--bg-secondary);
-            border-radius: 8px;
-        }
-        
-        .uptime-value {
-            font-size: 1.25rem;
-            font-weight: 600;
-            font-family: 'JetBrains Mono', monospace;
-            color: var(--accent-green);
-        }
-        
-        /* Timing Card */
-        .timing-card {
-            grid-column: span 2;
-        }
-        
-        .timing-stats {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 1rem;
-        }
-        
-        .timing-stat {
-            text-align: center;
-            padding: 0.75rem;
-            background: var(--bg-secondary);
-            border-radius: 8px;
-        }
-        
-        .timing-stat-value {
-            font-size: 1.5rem;
-            font-weight: 700;
-        }
-        
-        .timing-stat-value.fast {
-            color: var(--accent-green);
-        }
-        
-        .timing-stat-value.medium {
-            color: var(--accent-yellow);
-        }
-        
-        .timing-stat-value.slow {
-            color: var(--accent-red);
-        }
-        
-        .timing-stat-label {
-            font-size: 0.7rem;
-            color: var(--text-secondary);
-            text-transform: uppercase;
-            margin-top: 0.25rem;
-        }
-        
-        .timing-buckets {
-            display: flex;
-            gap: 0.5rem;
-            margin-top: 1rem;
-        }
-        
-        .timing-bucket {
-            flex: 1;
-            text-align: center;
-            padding: 0.5rem;
-            background: var(--bg-secondary);
-            border-radius: 6px;
-            font-size: 0.75rem;
-        }
-        
-        .timing-bucket-count {
-            font-size: 1.25rem;
-            font-weight: 600;
-            display: block;
-        }
-        
-        .timing-bucket.fast .timing-bucket-count {
-            color: var(--accent-green);
-        }
-        
-        .timing-bucket.medium .timing-bucket-count {
-            color: var(--accent-blue);
-        }
-        
-        .timing-bucket.slow .timing-bucket-count {
-            color: var(--accent-yellow);
-        }
-        
-        .timing-bucket.very-slow .timing-bucket-count {
-            color: var(--accent-red);
-        }
-        
-        .timing-recent {
-            margin-top: 1rem;
-            max-height: 150px;
-            overflow-y: auto;
-        }
-        
-        .timing-recent-item {
-            display: flex;
-            justify-content: space-between;
-            padding: 0.25rem 0;
-            font-size: 0.75rem;
-            border-bottom: 1px solid var(--border-color);
-        }
-        
-        .timing-duration {
-            font-weight: 600;
-        }
-        
-        .timing-duration.fast { color: var(--accent-green); }
-        .timing-duration.medium { color: var(--accent-yellow); }
-        .timing-duration.slow { color: var(--accent-red); }
-        
-        /* Markets Card */
-        .markets-card {
-            grid-column: span 2;
-        }
-        
-        .market-item {
-            display: grid;
-            grid-template-columns: 1fr auto auto auto;
-            gap: 1rem;
-            padding: 0.75rem;
-            border-bottom: 1px solid var(--border-color);
-            font-size: 0.85rem;
-        }
-        
-        .market-name {
-            white-space: nowrap;
-            overflow: hidden;
-            text-overflow: ellipsis;
-        }
-        
-        .market-price {
-            font-weight: 600;
-        }
-        
-        .market-spread {
-            color: var(--text-secondary);
-        }
-        
-        /* Scrollbar */
-        ::-webkit-scrollbar {
-            width: 6px;
-        }
-        
-        ::-webkit-scrollbar-track {
-            background: var(--bg-secondary);
-        }
-        
-        ::-webkit-scrollbar-thumb {
-            background: var(--border-color);
-            border-radius: 3px;
-        }
-        
-        ::-webkit-scrollbar-thumb:hover {
-            background: var(--text-secondary);
-        }
-        
-        /* Empty State */
-        .empty-state {
-            text-align: center;
-            padding: 2rem;
-            color: var(--text-secondary);
-        }
-        
-        .empty-icon {
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-        }
-        
-        /* Connection Status */
-        .connection-status {
-            position: fixed;
-            bottom: 1rem;
-            right: 1rem;
-            padding: 0.5rem 1rem;
-            border-radius: 8px;
-            font-size: 0.75rem;
-            background: var(--bg-card);
-            border: 1px solid var(--border-color);
-        }
-        
-        .connection-status.connected {
-            border-color: var(--accent-green);
-        }
-        
-        .connection-status.disconnected {
-            border-color: var(--accent-red);
-        }
-        
-        @media (max-width: 1400px) {
-            .dashboard {
-                grid-template-columns: repeat(2, 1fr);
-            }
-            
-            .metrics {
-                grid-column: span 2;
-                grid-template-columns: repeat(3, 1fr);
-            }
-            
-            .opportunities-card,
-            .activity-card {
-                grid-column: span 2;
-                grid-row: span 1;
-            }
-            
-            .portfolio-card,
-            .risk-card,
-            .markets-card {
-                grid-column: span 2;
-            }
-        }
-    </style>
+
+    @app.get("/api/risk")
+    async def get_risk():
+        """Get risk metrics."""
+        return dashboard_state.risk
+
+    @app.get("/api/timing")
+    async def get_timing():
+        """Get opportunity timing statistics."""
+        return dashboard_state.timing
+
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        """WebSocket endpoint for real-time updates."""
+        # Optional Origin allowlist (defends against cross-site WebSocket hijacking)
+        origin = websocket.headers.get("origin")
+        if origin and DASHBOARD_ALLOWED_ORIGINS and origin not in DASHBOARD_ALLOWED_ORIGINS:
+            await websocket.close(code=1008)
+            return
+
+        # Optional token auth
+        if DASHBOARD_TOKEN:
+            token = _extract_bearer_token(websocket.headers.get("authorization")) or websocket.query_params.get("token")
+            if not token or not _constant_time_equals(token, _DASHBOARD_TOKEN_BYTES):
+                await websocket.close(code=1008)
+                return
+
+        # Connection limit (basic DoS protection)
+        if len(dashboard_state._connections) >= DASHBOARD_MAX_WS_CONNECTIONS:
+            await websocket.close(code=1013)  # Try again later
+            return
+
+        await websocket.accept()
+        dashboard_state._connections.add(websocket)
+        if websocket.query_params.get("format") == "msgpack":
+            dashboard_state.enable_binary(websocket)
+        if websocket.query_params.get("compress") == "gzip":
+            dashboard_state.enable_gzip(websocket)
+        dashboard_state.start_heartbeat()
+
+        try:
+            # A reconnecting client gets only the frames it missed; anyone
+            # else starts from the full state
+            params = websocket.query_params
+            if not dashboard_state.resume(websocket, params.get("session"), params.get("since")):
+                dashboard_state.reset_state_patches()
+                dashboard_state.send_initial(websocket)
+
+            # Receive any commands; heartbeats come from the shared task
+            while True:
+                data = await websocket.receive_text()
+
+                # Ignore oversized payloads to avoid memory/CPU abuse
+                if _utf8_len_exceeds(data, DASHBOARD_MAX_WS_MESSAGE_BYTES):
+                    continue
+
+                # Keepalive fast path: the client's ping is always this exact text
+                if data == _PING_TEXT:
+                    _handle_ping(websocket, None)
+                    continue
+
+                try:
+                    msg = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    # Ignore malformed client messages
+                    continue
+                handler = _WS_HANDLERS.get(msg.get("type")) if isinstance(msg, dict) else None
+                if handler is not None:
+                    handler(websocket, msg)
+
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error(f"WebSocket error: {e}")
+        finally:
+            dashboard_state.disconnect(websocket)
+
+    return app
+
+
+@dataclass(frozen=True)
+class _StaticAsset:
+    """A static file held in memory, precompressed, under a content-hashed URL."""
+    url: str
+    media_type: str
+    body: bytes
+    gzip_body: bytes
+    br_body: Optional[bytes]
+    etag: str
+
+
+def _load_static_asset(filename: str, media_type: str) -> _StaticAsset:
+    body = (STATIC_DIR / filename).read_bytes()
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    stem, ext = filename.rsplit(".", 1)
+    return _StaticAsset(
+        url=f"/static/{stem}.{digest}.{ext}",
+        media_type=media_type,
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        br_body=brotli.compress(body, quality=11) if brotli is not None else None,
+        etag=f'W/"{digest}"',
+    )
+
+
+def _accepted_encodings(accept: str) -> set[str]:
+    """Return the content codings an Accept-Encoding header allows (q > 0)."""
+    weights: dict[str, float] = {}
+    for token in accept.split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    accepted = {coding for coding, q in weights.items() if q > 0}
+    if "*" in accepted:
+        # The wildcard covers every coding the header does not name itself
+        accepted |= {coding for coding in ("br", "gzip") if coding not in weights}
+    return accepted
+
+
+def _negotiate_encoding(
+    request: Request, headers: dict, body: bytes, gzip_body: bytes, br_body: Optional[bytes] = None
+) -> bytes:
+    """Pick the precompressed body the client accepts, setting Content-Encoding."""
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    if br_body is not None and "br" in accepted:
+        headers["Content-Encoding"] = "br"
+        return br_body
+    if "gzip" in accepted:
+        headers["Content-Encoding"] = "gzip"
+        return gzip_body
+    return body
+
+
+def _asset_endpoint(asset: _StaticAsset):
+    async def serve_asset(request: Request):
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": f"public, max-age={STATIC_ASSET_MAX_AGE}, immutable",
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("if-none-match") == asset.etag:
+            return Response(status_code=304, headers=headers)
+        body = _negotiate_encoding(request, headers, asset.body, asset.gzip_body, asset.br_body)
+        return Response(body, media_type=asset.media_type, headers=headers)
+    return serve_asset
+
+
+# Linked from the page as {name} placeholders, replaced by their hashed URLs
+_STATIC_ASSETS = {
+    "dashboard.css": _load_static_asset("dashboard.css", "text/css; charset=utf-8"),
+    "dashboard.js": _load_static_asset("dashboard.js", "text/javascript; charset=utf-8"),
+}
+
+
+def get_embedded_html() -> str:
+    """Return embedded HTML for the dashboard."""
+    html = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Polymarket Arbitrage Dashboard</title>
+    <link rel="stylesheet" href="{dashboard.css}">
+    <link rel="modulepreload" href="{dashboard.js}">
 </head>
 <body>
     <header class="header">
@@ -1485,7 +1021,7 @@ def get_embedded_html() -> str:
                         <span id="riskExposure">$0 / $5,000</span>
                     </div>
                     <div class="risk-bar">
-                        <div class="risk-bar-fill safe" id="exposureBar" style="width: 0%"></div>
+                        <div class="risk-bar-fill safe" id="exposureBar"></div>
                     </div>
                 </div>
                 <div class="risk-item">
@@ -1494,7 +1030,7 @@ def get_embedded_html() -> str:
                         <span id="riskDailyPnl">$0 / -$500</span>
                     </div>
                     <div class="risk-bar">
-                        <div class="risk-bar-fill safe" id="dailyPnlBar" style="width: 0%"></div>
+                        <div class="risk-bar-fill safe" id="dailyPnlBar"></div>
                     </div>
                 </div>
                 <div class="risk-item">
@@ -1503,7 +1039,7 @@ def get_embedded_html() -> str:
                         <span id="riskDrawdown">0% / 10%</span>
                     </div>
                     <div class="risk-bar">
-                        <div class="risk-bar-fill safe" id="drawdownBar" style="width: 0%"></div>
+                        <div class="risk-bar-fill safe" id="drawdownBar"></div>
                     </div>
                 </div>
                 <div id="killSwitch" style="display: none; padding: 0.75rem; background: rgba(255,68,102,0.2); border-radius: 8px; text-align: center; color: var(--accent-red); font-weight: 600;">
@@ -1566,7 +1102,7 @@ def get_embedded_html() -> str:
                         <span id="matchingProgressText" style="font-size: 0.8rem; color: #f7931a;">0%</span>
                     </div>
                     <div style="background: var(--bg-secondary); border-radius: 4px; height: 8px; overflow: hidden;">
-                        <div id="matchingProgressBar" style="background: linear-gradient(90deg, #f7931a, #ff6b35); height: 100%; width: 0%; transition: width 0.3s;"></div>
+                        <div id="matchingProgressBar"></div>
                     </div>
                     <div id="matchingStats" style="font-size: 0.7rem; color: var(--text-muted); margin-top: 0.25rem;">
                         Checked: 0 / 0 comparisons | Found: 0 matches
@@ -1677,7 +1213,7 @@ def get_embedded_html() -> str:
                 <span class="card-title">Monitored Markets</span>
             </div>
             <div class="card-body">
-                <div id="marketList">
+                <div class="market-list" id="marketList">
                     <div class="empty-state">
                         <div class="empty-icon">📈</div>
                         <div>Loading markets...</div>
@@ -1691,851 +1227,146 @@ def get_embedded_html() -> str:
         Connecting...
     </div>
     
-    <script>
-        let ws = null;
-        let state = {};
-        let reconnectAttempts = 0;
-
-        const urlParams = new URLSearchParams(window.location.search);
-        const dashboardToken = urlParams.get('token');
-
-        function authUrl(path) {
-            if (!dashboardToken) return path;
-            const sep = path.includes('?') ? '&' : '?';
-            return `${path}${sep}token=${encodeURIComponent(dashboardToken)}`;
-        }
-
-        
-        function connect() {
-            const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            ws = new WebSocket(`${protocol}//${window.location.host}/ws${dashboardToken ? `?token=${encodeURIComponent(dashboardToken)}` : ''}`);
-            
-            ws.onopen = () => {
-                console.log('WebSocket connected');
-                document.getElementById('connectionStatus').textContent = '🟢 Connected';
-                document.getElementById('connectionStatus').className = 'connection-status connected';
-                reconnectAttempts = 0;
-            };
-            
-            ws.onclose = () => {
-                console.log('WebSocket disconnected');
-                document.getElementById('connectionStatus').textContent = '🔴 Disconnected';
-                document.getElementById('connectionStatus').className = 'connection-status disconnected';
-                setTimeout(reconnect, Math.min(1000 * Math.pow(2, reconnectAttempts), 30000));
-                reconnectAttempts++;
-            };
-            
-            ws.onerror = (error) => {
-                console.error('WebSocket error:', error);
-            };
-            
-            ws.onmessage = (event) => {
-                const msg = JSON.parse(event.data);
-                
-                if (msg.type === 'initial' || msg.type === 'update') {
-                    state = msg.data || msg;
-                    updateDashboard();
-                } else if (msg.type === 'opportunity') {
-                    addOpportunity(msg.data);
-                } else if (msg.type === 'activity') {
-                    addActivity(msg.data);
-                }
-            };
-        }
-        
-        function reconnect() {
-            if (ws && ws.readyState === WebSocket.OPEN) return;
-            connect();
-        }
-        
-        function updateDashboard() {
-            // Status
-            const statusDot = document.getElementById('statusDot');
-            const statusText = document.getElementById('statusText');
-            if (state.is_running) {
-                statusDot.className = 'status-dot running';
-                statusText.textContent = 'Running';
-            } else {
-                statusDot.className = 'status-dot stopped';
-                statusText.textContent = 'Stopped';
-            }
-            
-            // Mode
-            const modeBadge = document.getElementById('modeBadge');
-            if (state.mode === 'live') {
-                modeBadge.className = 'mode-badge live';
-                modeBadge.textContent = 'LIVE';
-            } else {
-                modeBadge.className = 'mode-badge dry-run';
-                modeBadge.textContent = 'DRY RUN';
-            }
-            
-            // Metrics
-            updateMetrics();
-            
-            // Opportunities
-            updateOpportunities();
-            
-            // Activity
-            updateActivity();
-            
-            // Risk
-            updateRisk();
-            
-            // Timing
-            updateTiming();
-            
-            // Operational
-            updateOperational();
-            
-            // Cross-Platform
-            updateCrossPlatform();
-            
-            // Markets
-            updateMarkets();
-        }
-        
-        function updateMetrics() {
-            const portfolio = state.portfolio || {};
-            const pnl = portfolio.pnl || {};
-            const stats = state.stats || {};
-            
-            const totalPnl = pnl.total_pnl || 0;
-            const realizedPnl = pnl.realized_pnl || 0;
-            const exposure = portfolio.total_exposure || 0;
-            const winRate = (portfolio.win_rate || 0) * 100;
-            
-            document.getElementById('totalPnl').textContent = formatCurrency(totalPnl);
-            document.getElementById('totalPnl').className = `metric-value ${totalPnl >= 0 ? 'positive' : 'negative'}`;
-            
-            document.getElementById('realizedPnl').textContent = formatCurrency(realizedPnl);
-            document.getElementById('realizedPnl').className = `metric-value ${realizedPnl >= 0 ? 'positive' : 'negative'}`;
-            
-            document.getElementById('exposure').textContent = formatCurrency(exposure);
-            document.getElementById('openOrders').textContent = (state.orders || []).length;
-            document.getElementById('opportunityCount').textContent = (state.opportunities || []).length;
-            document.getElementById('winRate').textContent = `${winRate.toFixed(1)}%`;
-            document.getElementById('winRate').className = `metric-value ${winRate >= 50 ? 'positive' : winRate > 0 ? 'neutral' : 'negative'}`;
-        }
-        
-        function updateOpportunities() {
-            const list = document.getElementById('opportunityList');
-            const opportunities = state.opportunities || [];
-            
-            if (opportunities.length === 0) {
-                list.innerHTML = '<div class="empty-state"><div class="empty-icon">📊</div><div>Waiting for opportunities...</div></div>';
-                return;
-            }
-            
-            const recent = opportunities.slice(-20).reverse();
-            list.innerHTML = recent.map(opp => {
-                const typeClass = opp.type?.includes('bundle') ? 
-                    (opp.type.includes('long') ? 'bundle-long' : 'bundle-short') : 'mm';
-                const typeLabel = opp.type?.replace('_', ' ').toUpperCase() || 'UNKNOWN';
-                
-                return `
-                    <div class="opportunity-item">
-                        <span class="opportunity-type ${typeClass}">${typeLabel}</span>
-                        <div class="opportunity-details">
-                            <div class="opportunity-market">${opp.market_id || 'Unknown'}</div>
-                            <span class="opportunity-edge">Edge: ${((opp.edge || 0) * 100).toFixed(2)}%</span>
+    <!-- Row templates: cloned by the list renderers, text is set directly -->
+    <template id="tplOpportunityRow">
+        <div class="opportunity-item">
+            <span class="opportunity-type"></span>
+            <div class="opportunity-details">
+                <div class="opportunity-market"></div>
+                <span class="opportunity-edge"></span>
+            </div>
+            <span class="opportunity-time"></span>
+        </div>
+    </template>
+    
+    <template id="tplActivityRow">
+        <div class="activity-item">
+            <div class="activity-icon"></div>
+            <div class="activity-content">
+                <div class="activity-message"></div>
+                <div class="activity-time"></div>
+            </div>
+        </div>
+    </template>
+    
+    <template id="tplPairRow">
+        <div class="market-item">
+            <div class="market-question">
+                <span class="opp-badge" style="font-size: 0.6rem; margin-right: 0.5rem;"></span>
+                <span></span>
+            </div>
+            <div class="market-prices">
+                <span style="color: #8b5cf6; font-size: 0.7rem;"></span>
+                <span style="color: #f7931a; font-size: 0.7rem;"></span>
+                <span style="color: var(--text-muted); font-size: 0.65rem;"></span>
+            </div>
+        </div>
+    </template>
+    
+    <template id="tplMarketRow">
+        <div class="market-item">
+            <span class="market-name"></span>
+            <span class="market-price"></span>
+            <span class="market-spread"></span>
+        </div>
+    </template>
+    
+    <template id="tplFeedCard">
+        <div class="feed-row">
+            <div class="opp-card">
+                <div class="opp-header">
+                    <div class="opp-category">
+                        <span class="opp-badge"></span>
+                        <span class="opp-badge cross">CROSS</span>
+                    </div>
+                    <div></div>
+                </div>
+                <div class="opp-title"></div>
+                <div class="opp-market-info">
+                    <span style="opacity: 0.6;">📊</span> <span></span>
+                    <span style="margin-left: 0.5rem; color: var(--accent-green);">● Active</span>
+                </div>
+                <div class="opp-platforms">
+                    <div class="opp-platform-row">
+                        <div class="opp-platform-name">
+                            <span class="opp-platform-icon"></span>
+                            <span></span>
+                            <span style="margin-left: auto; font-size: 0.65rem; color: var(--accent-green);">↗</span>
                         </div>
-                        <span class="opportunity-time">${formatTime(opp.timestamp)}</span>
+                        <div class="opp-platform-price"></div>
                     </div>
-                `;
-            }).join('');
-            
-            document.getElementById('oppRefresh').textContent = `Last: ${formatTime(state.last_update)}`;
-        }
-        
-        function updateActivity() {
-            const list = document.getElementById('activityList');
-            const signals = state.signals || [];
-            const trades = state.trades || [];
-            
-            // Combine and sort by timestamp
-            const activities = [
-                ...signals.map(s => ({...s, activityType: 'signal'})),
-                ...trades.map(t => ({...t, activityType: 'trade'}))
-            ].sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp)).slice(0, 30);
-            
-            if (activities.length === 0) {
-                list.innerHTML = '<div class="empty-state"><div class="empty-icon">📝</div><div>No activity yet...</div></div>';
-                return;
-            }
-            
-            list.innerHTML = activities.map(act => {
-                let icon = '📋';
-                let iconClass = 'signal';
-                let message = '';
-                
-                if (act.activityType === 'trade') {
-                    icon = '✓';
-                    iconClass = 'fill';
-                    message = `${act.side} ${(act.size || 0).toFixed(2)} @ ${(act.price || 0).toFixed(4)}`;
-                } else {
-                    icon = '→';
-                    iconClass = 'signal';
-                    message = `${act.action || 'Signal'}: ${act.market_id || ''}`;
-                }
-                
-                return `
-                    <div class="activity-item">
-                        <div class="activity-icon ${iconClass}">${icon}</div>
-                        <div class="activity-content">
-                            <div class="activity-message">${message}</div>
-                            <div class="activity-time">${formatTime(act.timestamp)}</div>
+                    <div class="opp-platform-row">
+                        <div class="opp-platform-name">
+                            <span class="opp-platform-icon"></span>
+                            <span></span>
+                            <span style="margin-left: auto; font-size: 0.65rem; color: #ef4444;">↘</span>
                         </div>
+                        <div class="opp-platform-price"></div>
                     </div>
-                `;
-            }).join('');
-        }
-        
-        function updateRisk() {
-            const risk = state.risk || {};
-            
-            const exposure = risk.global_exposure || 0;
-            const maxExposure = risk.max_global_exposure || 5000;
-            const exposurePct = (exposure / maxExposure) * 100;
-            
-            document.getElementById('riskExposure').textContent = `$${exposure.toFixed(0)} / $${maxExposure.toLocaleString()}`;
-            document.getElementById('exposureBar').style.width = `${Math.min(exposurePct, 100)}%`;
-            document.getElementById('exposureBar').className = `risk-bar-fill ${exposurePct < 60 ? 'safe' : exposurePct < 80 ? 'warning' : 'danger'}`;
-            
-            const dailyPnl = risk.daily_pnl || 0;
-            const maxLoss = risk.max_daily_loss || 500;
-            const dailyPnlPct = Math.abs(Math.min(dailyPnl, 0)) / maxLoss * 100;
-            
-            document.getElementById('riskDailyPnl').textContent = `$${dailyPnl.toFixed(2)} / -$${maxLoss}`;
-            document.getElementById('dailyPnlBar').style.width = `${Math.min(dailyPnlPct, 100)}%`;
-            document.getElementById('dailyPnlBar').className = `risk-bar-fill ${dailyPnlPct < 50 ? 'safe' : dailyPnlPct < 80 ? 'warning' : 'danger'}`;
-            
-            const drawdown = (risk.current_drawdown_pct || 0);
-            const maxDrawdown = (risk.max_drawdown_pct || 10);
-            const drawdownPct = (drawdown / maxDrawdown) * 100;
-            
-            document.getElementById('riskDrawdown').textContent = `${drawdown.toFixed(1)}% / ${maxDrawdown}%`;
-            document.getElementById('drawdownBar').style.width = `${Math.min(drawdownPct, 100)}%`;
-            document.getElementById('drawdownBar').className = `risk-bar-fill ${drawdownPct < 50 ? 'safe' : drawdownPct < 80 ? 'warning' : 'danger'}`;
-            
-            document.getElementById('killSwitch').style.display = risk.kill_switch_triggered ? 'block' : 'none';
-        }
-        
-        function updateTiming() {
-            const timing = state.timing || {};
-            
-            // Update count
-            document.getElementById('timingCount').textContent = `${timing.total_tracked || 0} tracked`;
-            
-            // Update main stats
-            const avgDuration = timing.avg_duration_ms;
-            if (avgDuration !== undefined && avgDuration !== null) {
-                document.getElementById('avgDuration').textContent = formatDuration(avgDuration);
-                document.getElementById('avgDuration').className = `timing-stat-value ${getDurationClass(avgDuration)}`;
-            }
-            
-            const minDuration = timing.min_duration_ms;
-            if (minDuration !== undefined && minDuration !== null) {
-                document.getElementById('minDuration').textContent = formatDuration(minDuration);
-                document.getElementById('minDuration').className = `timing-stat-value ${getDurationClass(minDuration)}`;
-            }
-            
-            const maxDuration = timing.max_duration_ms;
-            if (maxDuration !== undefined && maxDuration !== null) {
-                document.getElementById('maxDuration').textContent = formatDuration(maxDuration);
-                document.getElementById('maxDuration').className = `timing-stat-value ${getDurationClass(maxDuration)}`;
-            }
-            
-            document.getElementById('activeOpps').textContent = timing.active_opportunities || 0;
-            
-            // Update buckets
-            document.getElementById('under100ms').textContent = timing.under_100ms || 0;
-            document.getElementById('under500ms').textContent = timing.under_500ms || 0;
-            document.getElementById('under1s').textContent = timing.under_1s || 0;
-            document.getElementById('over1s').textContent = timing.over_1s || 0;
-            
-            // Update recent timings
-            const recentList = document.getElementById('recentTimings');
-            const recent = timing.recent_durations || [];
-            
-            if (recent.length === 0) {
-                recentList.innerHTML = '<div style="text-align: center; color: var(--text-secondary); padding: 1rem;">Waiting for opportunity data...</div>';
-                return;
-            }
-            
-            recentList.innerHTML = recent.slice().reverse().map(item => {
-                const durationClass = getDurationClass(item.duration_ms);
-                const typeLabel = item.type?.replace('_', ' ') || 'unknown';
-                const executedBadge = item.executed ? '<span style="color: var(--accent-green);">✓</span>' : '';
-                
-                return `
-                    <div class="timing-recent-item">
-                        <span>${typeLabel} ${executedBadge}</span>
-                        <span class="timing-duration ${durationClass}">${formatDuration(item.duration_ms)}</span>
+                </div>
+            </div>
+        </div>
+    </template>
+    
+    <template id="tplPairCard">
+        <div class="pair-card">
+            <div class="pair-header">
+                <span class="pair-sport-badge"></span>
+                <span class="pair-arb-badge">⚡ Arb Available</span>
+            </div>
+            <div class="pair-title"></div>
+            <div class="pair-platforms">
+                <div class="platform-box">
+                    <div class="platform-name">
+                        <span class="dot polymarket"></span>
+                        <span>Polymarket</span>
                     </div>
-                `;
-            }).join('');
-        }
-        
-        function formatDuration(ms) {
-            if (ms === undefined || ms === null) return '--';
-            if (ms < 1000) return `${Math.round(ms)}ms`;
-            return `${(ms / 1000).toFixed(1)}s`;
-        }
-        
-        function getDurationClass(ms) {
-            if (ms < 200) return 'fast';
-            if (ms < 1000) return 'medium';
-            return 'slow';
-        }
-        
-        let lastUpdateCount = 0;
-        let lastUpdateTime = Date.now();
-        
-        function updateOperational() {
-            const op = state.operational || {};
-            const cp = state.cross_platform || {};
-            
-            // Show combined market count (Polymarket + Kalshi)
-            const polyCount = cp.polymarket_markets || 0;
-            const kalshiCount = cp.kalshi_markets || 0;
-            const totalCombined = polyCount + kalshiCount;
-            
-            // Update stats - show combined if cross-platform is enabled
-            const totalEl = document.getElementById('totalMarkets');
-            if (cp.enabled && totalCombined > 0) {
-                totalEl.innerHTML = `<span style="color: #8b5cf6;">${polyCount.toLocaleString()}</span> + <span style="color: #f7931a;">${kalshiCount.toLocaleString()}</span>`;
-            } else {
-                totalEl.textContent = op.total_markets || 0;
-            }
-            document.getElementById('marketsWithData').textContent = op.markets_with_orderbooks || 0;
-            document.getElementById('marketsWithPrices').textContent = op.markets_with_prices || 0;
-            document.getElementById('orderbookUpdates').textContent = formatNumber(op.orderbook_updates || 0);
-            
-            // Calculate updates per minute
-            const now = Date.now();
-            const timeDiff = (now - lastUpdateTime) / 1000; // seconds
-            const updateDiff = (op.orderbook_updates || 0) - lastUpdateCount;
-            
-            if (timeDiff > 0 && lastUpdateCount > 0) {
-                const updatesPerMin = Math.round((updateDiff / timeDiff) * 60);
-                document.getElementById('updatesPerMin').textContent = updatesPerMin;
-            }
-            
-            lastUpdateCount = op.orderbook_updates || 0;
-            lastUpdateTime = now;
-            
-            // Estimate cycle time (time to check all markets)
-            const totalMarkets = op.total_markets || 1;
-            const updatesPerSec = (op.orderbook_updates || 0) / Math.max(state.uptime_seconds || 1, 1);
-            if (updatesPerSec > 0) {
-                const cycleSeconds = totalMarkets / updatesPerSec;
-                document.getElementById('cycleTime').textContent = formatCycleTime(cycleSeconds);
-            }
-            
-            // Stream status
-            const statusEl = document.getElementById('streamStatus');
-            if (op.is_streaming) {
-                statusEl.textContent = '● Streaming';
-                statusEl.style.color = 'var(--accent-green)';
-            } else {
-                statusEl.textContent = '○ Stopped';
-                statusEl.style.color = 'var(--accent-red)';
-            }
-            
-            // Uptime
-            if (state.uptime_seconds) {
-                document.getElementById('uptime').textContent = formatUptime(state.uptime_seconds);
-            }
-        }
-        
-        function escapeHtml(str) {
-            if (str === null || str === undefined) return '';
-            return String(str)
-                .replaceAll('&', '&amp;')
-                .replaceAll('<', '&lt;')
-                .replaceAll('>', '&gt;')
-                .replaceAll('"', '&quot;')
-                .replaceAll("'", '&#039;');
-        }
-
-function formatNumber(num) {
-            if (num >= 1000000) return (num / 1000000).toFixed(1) + 'M';
-            if (num >= 1000) return (num / 1000).toFixed(1) + 'K';
-            return num.toString();
-        }
-        
-        function formatCycleTime(seconds) {
-            if (seconds < 60) return Math.round(seconds) + 's';
-            if (seconds < 3600) return Math.round(seconds / 60) + 'm';
-            return (seconds / 3600).toFixed(1) + 'h';
-        }
-        
-        function formatUptime(seconds) {
-            const hrs = Math.floor(seconds / 3600);
-            const mins = Math.floor((seconds % 3600) / 60);
-            const secs = Math.floor(seconds % 60);
-            return `${hrs.toString().padStart(2, '0')}:${mins.toString().padStart(2, '0')}:${secs.toString().padStart(2, '0')}`;
-        }
-        
-        function updateCrossPlatform() {
-            const cp = state.cross_platform || {};
-            
-            // Update status badge
-            const statusEl = document.getElementById('crossPlatformStatus');
-            if (cp.enabled) {
-                statusEl.textContent = 'ACTIVE';
-                statusEl.style.background = 'linear-gradient(135deg, #00ff88, #00cc66)';
-            } else {
-                statusEl.textContent = 'DISABLED';
-                statusEl.style.background = 'linear-gradient(135deg, #666, #444)';
-            }
-            
-            // Update stats
-            const polyCount = cp.polymarket_markets || 0;
-            const kalshiCount = cp.kalshi_markets || 0;
-            const matchedCount = cp.matched_pairs || 0;
-            const kalshiObs = cp.kalshi_orderbooks || 0;
-            
-            document.getElementById('polymarketMarkets').textContent = polyCount.toLocaleString();
-            document.getElementById('kalshiMarkets').textContent = kalshiCount.toLocaleString();
-            document.getElementById('matchedPairs').textContent = matchedCount;
-            document.getElementById('kalshiOrderbooks').textContent = kalshiObs;
-            
-            // Update status indicators with loading animation
-            const polyStatus = document.getElementById('polymarketStatus');
-            const kalshiStatus = document.getElementById('kalshiStatus');
-            
-            // Polymarket status
-            if (polyCount >= 5000) {
-                polyStatus.textContent = '✓ Loaded';
-                polyStatus.className = 'platform-stat-status ready';
-            } else if (polyCount > 0) {
-                polyStatus.textContent = `⏳ ${polyCount.toLocaleString()}...`;
-                polyStatus.className = 'platform-stat-status loading';
-            } else {
-                polyStatus.textContent = '⏳ Loading...';
-                polyStatus.className = 'platform-stat-status loading';
-            }
-            
-            // Kalshi status
-            if (kalshiCount >= 5000) {
-                kalshiStatus.textContent = '✓ Loaded';
-                kalshiStatus.className = 'platform-stat-status ready';
-            } else if (kalshiCount > 0) {
-                kalshiStatus.textContent = `⏳ ${kalshiCount.toLocaleString()}...`;
-                kalshiStatus.className = 'platform-stat-status loading';
-            } else {
-                kalshiStatus.textContent = '⏳ Loading...';
-                kalshiStatus.className = 'platform-stat-status loading';
-            }
-            
-            const matchStatus = document.getElementById('matchingStatus');
-            const kalshiObStatus = document.getElementById('kalshiObStatus');
-            
-            const matchingStatus = cp.matching_status || 'idle';
-            const matchingProgress = cp.matching_progress || 0;
-            const matchingChecked = cp.matching_checked || 0;
-            const matchingTotal = cp.matching_total || 0;
-            
-            // Update progress bar
-            const progressContainer = document.getElementById('matchingProgressContainer');
-            const progressBar = document.getElementById('matchingProgressBar');
-            const progressText = document.getElementById('matchingProgressText');
-            const matchingStatsEl = document.getElementById('matchingStats');
-            
-            if (matchingStatus === 'matching' || matchingStatus === 'starting') {
-                progressContainer.style.display = 'block';
-                progressBar.style.width = `${matchingProgress}%`;
-                progressText.textContent = `${matchingProgress}%`;
-                matchingStatsEl.textContent = `Checked: ${matchingChecked.toLocaleString()} / ${matchingTotal.toLocaleString()} | Found: ${matchedCount} matches`;
-                matchStatus.textContent = `🔍 ${matchingProgress}%`;
-                matchStatus.className = 'platform-stat-status scanning';
-            } else if (matchingStatus === 'complete') {
-                progressContainer.style.display = 'none';
-                matchStatus.textContent = `✓ ${matchedCount} pairs`;
-                matchStatus.className = 'platform-stat-status ready';
-            } else if (polyCount > 0 && kalshiCount > 0) {
-                progressContainer.style.display = 'none';
-                matchStatus.textContent = '⏳ Starting...';
-                matchStatus.className = 'platform-stat-status loading';
-            } else {
-                progressContainer.style.display = 'none';
-                matchStatus.textContent = 'Waiting...';
-                matchStatus.className = 'platform-stat-status';
-            }
-            
-            if (kalshiObs > 0) {
-                kalshiObStatus.textContent = `${kalshiObs} fetched`;
-                kalshiObStatus.className = 'platform-stat-status ready';
-            } else if (matchedCount > 0) {
-                kalshiObStatus.textContent = '⏳ Fetching...';
-                kalshiObStatus.className = 'platform-stat-status loading';
-            }
-            
-            const crossOpps = cp.cross_opportunities || [];
-            const matchedPairsData = cp.matched_pairs_data || [];
-            document.getElementById('crossOpportunities').textContent = crossOpps.length;
-            
-            // 🔥 Update Live Opportunities Feed
-            updateOpportunitiesFeed(state, cp, matchedPairsData);
-            
-            // Update arb status
-            const arbStatus = document.getElementById('arbStatus');
-            if (crossOpps.length > 0) {
-                arbStatus.textContent = `🎯 ${crossOpps.length} found!`;
-                arbStatus.className = 'platform-stat-status ready';
-            } else if (matchedCount > 0) {
-                arbStatus.textContent = '🔍 Scanning...';
-                arbStatus.className = 'platform-stat-status scanning';
-            } else {
-                arbStatus.textContent = 'Waiting...';
-                arbStatus.className = 'platform-stat-status';
-            }
-            
-            // Update matched pairs grid
-            const grid = document.getElementById('matchedPairsGrid');
-            if (!cp.enabled) {
-                grid.innerHTML = '<div style="text-align: center; color: var(--text-secondary); padding: 2rem; grid-column: 1 / -1;"><div style="font-size: 2rem; margin-bottom: 0.5rem;">⏸️</div><div>Cross-platform mode disabled</div></div>';
-                return;
-            }
-            
-            if (matchedPairsData.length === 0 && crossOpps.length === 0) {
-                const polyCount = cp.polymarket_markets || 0;
-                const kalshiCount = cp.kalshi_markets || 0;
-                grid.innerHTML = `<div style="text-align: center; color: var(--text-secondary); padding: 2rem; grid-column: 1 / -1;">
-                    <div style="font-size: 2rem; margin-bottom: 0.5rem;">🔍</div>
-                    <div>Scanning ${polyCount.toLocaleString()} Polymarket & ${kalshiCount.toLocaleString()} Kalshi markets...</div>
-                    <div style="font-size: 0.8rem; margin-top: 0.5rem;">Looking for matching NFL, NBA, Politics, Crypto predictions</div>
-                </div>`;
-                return;
-            }
-            
-            // Render matched pairs as cards (show opportunities first, then other pairs)
-            const allPairs = [...crossOpps.map(o => ({...o, hasArb: true})), ...matchedPairsData.slice(0, 20)];
-            
-            grid.innerHTML = allPairs.slice(0, 12).map((pair, idx) => {
-                const hasArb = pair.hasArb || false;
-                const edgePct = ((pair.edge_pct || 0) * 100);
-                const category = detectCategory(pair.poly_question || pair.market_pair || '');
-                
-                return `
-                    <div class="pair-card ${hasArb ? 'has-arb' : ''}">
-                        <div class="pair-header">
-                            <span class="pair-sport-badge">${category}</span>
-                            ${hasArb ? '<span class="pair-arb-badge">⚡ Arb Available</span>' : ''}
-                        </div>
-                        <div class="pair-title">${truncate(pair.poly_question || pair.kalshi_title || 'Market ' + (idx + 1), 60)}</div>
-                        <div class="pair-platforms">
-                            <div class="platform-box">
-                                <div class="platform-name">
-                                    <span class="dot polymarket"></span>
-                                    <span>Polymarket</span>
-                                </div>
-                                <div class="platform-prices">
-                                    <span class="yes">${formatPct(pair.poly_yes || pair.buy_price)}</span>
-                                    <span class="divider">/</span>
-                                    <span class="no">${formatPct(pair.poly_no || (1 - (pair.buy_price || 0.5)))}</span>
-                                </div>
-                            </div>
-                            <div class="platform-box">
-                                <div class="platform-name">
-                                    <span class="dot kalshi"></span>
-                                    <span>Kalshi</span>
-                                </div>
-                                <div class="platform-prices">
-                                    <span class="yes">${formatPct(pair.kalshi_yes || pair.sell_price)}</span>
-                                    <span class="divider">/</span>
-                                    <span class="no">${formatPct(pair.kalshi_no || (1 - (pair.sell_price || 0.5)))}</span>
-                                </div>
-                            </div>
-                        </div>
-                        <div class="pair-footer">
-                            <span>Similarity: ${((pair.similarity || 0.8) * 100).toFixed(0)}%</span>
-                            <span class="pair-edge ${edgePct > 1 ? 'positive' : 'negative'}">
-                                ${hasArb ? `Edge: +${edgePct.toFixed(1)}%` : 'No arb'}
-                            </span>
-                        </div>
+                    <div class="platform-prices">
+                        <span class="yes"></span>
+                        <span class="divider">/</span>
+                        <span class="no"></span>
                     </div>
-                `;
-            }).join('');
-        }
-        
-        // 🔥 Live Opportunities Feed Renderer
-        function updateOpportunitiesFeed(state, cp, matchedPairs) {
-            const feed = document.getElementById('opportunitiesFeed');
-            const noOpps = document.getElementById('noOpportunities');
-            const oppCount = document.getElementById('oppCount');
-            
-            // Collect ALL opportunities: bundle arb, cross-platform, and potential matches
-            let allOpportunities = [];
-            
-            // 1. Add Polymarket bundle arbitrage opportunities
-            const bundleOpps = state.opportunities || [];
-            bundleOpps.forEach(opp => {
-                allOpportunities.push({
-                    type: 'polymarket',
-                    title: opp.market_question || 'Bundle Arbitrage',
-                    category: detectCategory(opp.market_question || ''),
-                    edge: opp.net_edge_pct || opp.edge_pct || 0,
-                    platform1: { name: 'Polymarket', price: opp.yes_price || 0.5, action: 'BUY YES' },
-                    platform2: { name: 'Polymarket', price: opp.no_price || 0.5, action: 'BUY NO' },
-                    marketInfo: 'Bundle: YES + NO < 100%'
-                });
-            });
-            
-            // 2. Add cross-platform opportunities
-            const crossOpps = cp.cross_opportunities || [];
-            crossOpps.forEach(opp => {
-                allOpportunities.push({
-                    type: 'cross-platform',
-                    title: opp.market_pair || opp.token || 'Cross-Platform Arb',
-                    category: detectCategory(opp.market_pair || opp.token || ''),
-                    edge: opp.edge_pct || 0,
-                    platform1: { name: opp.buy_platform || 'Polymarket', price: opp.buy_price || 0, action: 'BUY' },
-                    platform2: { name: opp.sell_platform || 'Kalshi', price: opp.sell_price || 0, action: 'SELL' },
-                    marketInfo: `${opp.buy_platform} vs ${opp.sell_platform}`
-                });
-            });
-            
-            // 3. Add matched pairs as potential opportunities (show best matches)
-            if (matchedPairs && matchedPairs.length > 0) {
-                matchedPairs.slice(0, 20).forEach(pair => {
-                    // Only show high similarity matches
-                    if ((pair.similarity || 0) >= 0.6) {
-                        allOpportunities.push({
-                            type: 'matched',
-                            title: pair.poly_question || pair.kalshi_title || 'Matched Market',
-                            category: detectCategory(pair.poly_question || pair.kalshi_title || ''),
-                            edge: 0, // No arb found yet
-                            similarity: pair.similarity || 0,
-                            platform1: { name: 'Polymarket', price: pair.poly_yes || 0, action: 'Market' },
-                            platform2: { name: 'Kalshi', price: pair.kalshi_yes || 0, action: 'Market' },
-                            marketInfo: `Match: ${((pair.similarity || 0) * 100).toFixed(0)}% similar`
-                        });
-                    }
-                });
-            }
-            
-            // Sort by edge (highest first)
-            allOpportunities.sort((a, b) => (b.edge || 0) - (a.edge || 0));
-            
-            // Update count
-            const arbCount = allOpportunities.filter(o => o.edge > 0).length;
-            oppCount.textContent = arbCount > 0 ? `${arbCount} ARB found!` : `${allOpportunities.length} matches`;
-            
-            // If no opportunities, show scanning message
-            if (allOpportunities.length === 0) {
-                noOpps.style.display = 'block';
-                return;
-            }
-            
-            noOpps.style.display = 'none';
-            
-            // Render opportunity cards
-            const cardsHTML = allOpportunities.slice(0, 15).map(opp => {
-                const edgePct = (opp.edge * 100).toFixed(2);
-                const hasArb = opp.edge > 0;
-                const cardClass = opp.type === 'cross-platform' ? 'cross-platform' : 
-                                  opp.type === 'polymarket' ? 'polymarket' : 'kalshi';
-                const badgeClass = getBadgeClass(opp.category);
-                
-                return `
-                    <div class="opp-card ${cardClass}">
-                        <div class="opp-header">
-                            <div class="opp-category">
-                                <span class="opp-badge ${badgeClass}">${opp.category}</span>
-                                ${opp.type === 'cross-platform' ? '<span class="opp-badge cross">CROSS</span>' : ''}
-                            </div>
-                            ${hasArb ? 
-                                `<div class="opp-edge">+${edgePct}%</div>` : 
-                                (opp.similarity ? `<div style="color: var(--text-muted); font-size: 0.8rem;">${(opp.similarity * 100).toFixed(0)}% match</div>` : '')
-                            }
-                        </div>
-                        <div class="opp-title">${truncate(opp.title, 70)}</div>
-                        <div class="opp-market-info">
-                            <span style="opacity: 0.6;">📊</span> ${opp.marketInfo}
-                            ${hasArb ? '<span style="margin-left: 0.5rem; color: var(--accent-green);">● Active</span>' : ''}
-                        </div>
-                        <div class="opp-platforms">
-                            <div class="opp-platform-row">
-                                <div class="opp-platform-name">
-                                    <span class="opp-platform-icon ${opp.platform1.name.toLowerCase().includes('poly') ? 'poly' : 'kalshi'}">
-                                        ${opp.platform1.name.charAt(0)}
-                                    </span>
-                                    ${opp.platform1.name}
-                                    ${hasArb ? '<span style="margin-left: auto; font-size: 0.65rem; color: var(--accent-green);">↗</span>' : ''}
-                                </div>
-                                <div class="opp-platform-price ${hasArb ? 'buy' : ''}">${formatPct(opp.platform1.price)}</div>
-                            </div>
-                            <div class="opp-platform-row">
-                                <div class="opp-platform-name">
-                                    <span class="opp-platform-icon ${opp.platform2.name.toLowerCase().includes('kalshi') ? 'kalshi' : 'poly'}">
-                                        ${opp.platform2.name.charAt(0)}
-                                    </span>
-                                    ${opp.platform2.name}
-                                    ${hasArb ? '<span style="margin-left: auto; font-size: 0.65rem; color: #ef4444;">↘</span>' : ''}
-                                </div>
-                                <div class="opp-platform-price ${hasArb ? 'sell' : ''}">${formatPct(opp.platform2.price)}</div>
-                            </div>
-                        </div>
+                </div>
+                <div class="platform-box">
+                    <div class="platform-name">
+                        <span class="dot kalshi"></span>
+                        <span>Kalshi</span>
                     </div>
-                `;
-            }).join('');
-            
-            // Insert before the noOpportunities div
-            feed.innerHTML = cardsHTML + '<div class="no-opportunities" id="noOpportunities" style="display: none;"></div>';
-        }
-        
-        function getBadgeClass(category) {
-            const cat = category.toLowerCase();
-            if (cat.includes('nfl') || cat.includes('football')) return 'nfl';
-            if (cat.includes('nba') || cat.includes('basketball')) return 'nba';
-            if (cat.includes('politic') || cat.includes('trump') || cat.includes('election')) return 'politics';
-            if (cat.includes('crypto') || cat.includes('bitcoin')) return 'crypto';
-            if (cat.includes('soccer') || cat.includes('premier') || cat.includes('league')) return 'soccer';
-            return '';
-        }
-        
-        function detectCategory(text) {
-            const t = text.toLowerCase();
-            if (t.includes('nfl') || t.includes('football') || t.includes('bears') || t.includes('chiefs') || t.includes('packers')) return 'NFL';
-            if (t.includes('nba') || t.includes('basketball') || t.includes('lakers') || t.includes('celtics')) return 'NBA';
-            if (t.includes('trump') || t.includes('biden') || t.includes('election') || t.includes('president')) return 'Politics';
-            if (t.includes('bitcoin') || t.includes('btc') || t.includes('ethereum') || t.includes('crypto')) return 'Crypto';
-            if (t.includes('fed') || t.includes('rate') || t.includes('inflation')) return 'Finance';
-            return 'Other';
-        }
-        
-        function formatPct(val) {
-            if (val === undefined || val === null) return '??%';
-            return (val * 100).toFixed(0) + '%';
-        }
-        
-        function truncate(str, len) {
-            if (!str) return '';
-            return str.length > len ? str.substring(0, len) + '...' : str;
-        }
-        
-        function updateMarkets() {
-            const list = document.getElementById('marketList');
-            const markets = state.markets || {};
-            const marketIds = Object.keys(markets);
-            const cp = state.cross_platform || {};
-            
-            // Show cross-platform matched pairs if available
-            const matchedPairs = cp.matched_pairs_data || [];
-            
-            // If we have matched pairs from cross-platform, show those
-            if (matchedPairs.length > 0) {
-                list.innerHTML = matchedPairs.slice(0, 10).map((pair, idx) => {
-                    const category = detectCategory(pair.poly_question || pair.kalshi_title || '');
-                    const similarity = ((pair.similarity || 0) * 100).toFixed(0);
-                    return `
-                        <div class="market-item">
-                            <div class="market-question">
-                                <span class="opp-badge" style="font-size: 0.6rem; margin-right: 0.5rem;">${category}</span>
-                                ${truncate(pair.poly_question || pair.kalshi_title || 'Market', 50)}
-                            </div>
-                            <div class="market-prices">
-                                <span style="color: #8b5cf6; font-size: 0.7rem;">P: ${pair.poly_yes ? formatPct(pair.poly_yes) : '--'}</span>
-                                <span style="color: #f7931a; font-size: 0.7rem;">K: ${pair.kalshi_yes ? formatPct(pair.kalshi_yes) : '--'}</span>
-                                <span style="color: var(--text-muted); font-size: 0.65rem;">${similarity}% match</span>
-                            </div>
-                        </div>
-                    `;
-                }).join('');
-                return;
-            }
-            
-            // Show Polymarket markets if available
-            if (marketIds.length === 0) {
-                const polyCount = cp.polymarket_markets || 0;
-                const kalshiCount = cp.kalshi_markets || 0;
-                
-                if (polyCount > 0 || kalshiCount > 0) {
-                    list.innerHTML = `
-                        <div class="empty-state">
-                            <div class="empty-icon">🔄</div>
-                            <div>Loading orderbooks...</div>
-                            <div style="font-size: 0.75rem; color: var(--text-muted); margin-top: 0.5rem;">
-                                ${polyCount.toLocaleString()} Polymarket + ${kalshiCount.toLocaleString()} Kalshi markets
-                            </div>
-                        </div>
-                    `;
-                } else {
-                    list.innerHTML = '<div class="empty-state"><div class="empty-icon">📈</div><div>Loading markets...</div></div>';
-                }
-                return;
-            }
-            
-            list.innerHTML = marketIds.slice(0, 10).map(id => {
-                const m = markets[id];
-                const bid = m.best_bid_yes || 0;
-                const ask = m.best_ask_yes || 0;
-                const spread = ask - bid;
-                
-                return `
-                    <div class="market-item">
-                        <span class="market-name">${m.question || id}</span>
-                        <span class="market-price">${bid.toFixed(2)}/${ask.toFixed(2)}</span>
-                        <span class="market-spread">${(spread * 100).toFixed(1)}c</span>
+                    <div class="platform-prices">
+                        <span class="yes"></span>
+                        <span class="divider">/</span>
+                        <span class="no"></span>
                     </div>
-                `;
-            }).join('');
-        }
-        
-        function formatCurrency(value) {
-            const sign = value >= 0 ? '' : '-';
-            return `${sign}$${Math.abs(value).toFixed(2)}`;
-        }
-        
-        function formatTime(timestamp) {
-            if (!timestamp) return '';
-            const date = new Date(timestamp);
-            return date.toLocaleTimeString();
-        }
-        
-        function addOpportunity(opp) {
-            if (!state.opportunities) state.opportunities = [];
-            state.opportunities.push(opp);
-            updateOpportunities();
-        }
-        
-        function addActivity(activity) {
-            if (!state.signals) state.signals = [];
-            state.signals.push(activity);
-            updateActivity();
-        }
-        
-        // Ping to keep connection alive
-        setInterval(() => {
-            if (ws && ws.readyState === WebSocket.OPEN) {
-                ws.send(JSON.stringify({type: 'ping'}));
-            }
-        }, 25000);
-        
-        // Fetch initial state via REST as backup
-        async function fetchState() {
-            try {
-                const response = await fetch(authUrl('/api/state'));
-                state = await response.json();
-                updateDashboard();
-            } catch (e) {
-                console.error('Failed to fetch state:', e);
-            }
-        }
-        
-        // Initial load
-        connect();
-        fetchState();
-        
-        // Periodic refresh as backup
-        setInterval(fetchState, 5000);
-    </script>
+                </div>
+            </div>
+            <div class="pair-footer">
+                <span></span>
+                <span class="pair-edge"></span>
+            </div>
+        </div>
+    </template>
+    
+    <template id="tplTimingRow">
+        <div class="timing-recent-item">
+            <span><span></span> <span style="color: var(--accent-green);"></span></span>
+            <span class="timing-duration"></span>
+        </div>
+    </template>
+    
+    <script type="module" src="{dashboard.js}"></script>
 </body>
 </html>'''
+    for name, asset in _STATIC_ASSETS.items():
+        html = html.replace("{" + name + "}", asset.url)
+    return html
+
 
+# The page is static: encode, compress and hash it once. The ETag is weak so
+# the plain and compressed representations share it.
+_HTML_BYTES = get_embedded_html().encode("utf-8")
+_HTML_GZIP = gzip.compress(_HTML_BYTES, compresslevel=9, mtime=0)
+_HTML_BR = brotli.compress(_HTML_BYTES, quality=11) if brotli is not None else None
+_HTML_ETAG = f'W/"{hashlib.blake2b(_HTML_BYTES, digest_size=8).hexdigest()}"'
 
 # Create the app
 app = create_app()
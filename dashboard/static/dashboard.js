@@ -0,0 +1,1457 @@
+let ws = null;
+let state = {};
+let reconnectAttempts = 0;
+let stableTimer = 0;
+// Server session and last frame applied, so a reconnect can ask for
+// just the frames it missed instead of the full state
+let resumeFrom = null;
+
+// Reconnect delays by attempt, jittered so clients don't reconnect in lockstep
+const BACKOFF = [1000, 2000, 4000, 8000, 16000, 30000];
+const STABLE_CONNECTION_MS = 30000;
+
+function jitter(ms) {
+    return ms * (0.8 + Math.random() * 0.4);
+}
+
+const urlParams = new URLSearchParams(window.location.search);
+const dashboardToken = urlParams.get('token');
+
+function authUrl(path) {
+    if (!dashboardToken) return path;
+    const sep = path.includes('?') ? '&' : '?';
+    return `${path}${sep}token=${encodeURIComponent(dashboardToken)}`;
+}
+
+// Keyed rows: each row's DOM is built once per key, and later renders
+// only write the text/class values that actually changed.
+function setText(el, value) {
+    if (el._text !== value) {
+        el._text = value;
+        el.textContent = value;
+    }
+}
+
+function setClass(el, cls) {
+    if (el._cls !== cls) {
+        el._cls = cls;
+        el.className = cls;
+    }
+}
+
+// Bars fill via scaleX on a full-width element: transforms animate on
+// the compositor, where width would relayout every frame
+function setBarFill(el, pct) {
+    const scale = Math.max(0, Math.min(pct, 100)) / 100;
+    if (el._scale !== scale) {
+        el._scale = scale;
+        el.style.transform = `scaleX(${scale})`;
+    }
+}
+
+function uniqueKey(seen, key) {
+    // Disambiguate duplicate keys within a single render
+    let k = key;
+    for (let n = 1; seen.has(k); n++) k = `${key}#${n}`;
+    return k;
+}
+
+function createKeyedList(id, rows, emptyHtml) {
+    return {
+        container: document.getElementById(id),
+        rows,  // { key(item), create(item) -> {el, ...refs}, update(row, item) }
+        live: new Map(),
+        emptyHtml,
+        showingEmpty: true,
+    };
+}
+
+// Empty states are static markup, so it is only parsed again when it changes
+function showEmpty(list, html) {
+    if (list.shownEmpty === html) return;
+    list.shownEmpty = html;
+    list.container.innerHTML = html;
+}
+
+function renderKeyedList(kl, items, emptyHtml) {
+    const { container, rows } = kl;
+
+    if (items.length === 0) {
+        kl.live.clear();
+        kl.showingEmpty = true;
+        showEmpty(kl, emptyHtml !== undefined ? emptyHtml : kl.emptyHtml);
+        return;
+    }
+    // Coming from the empty state, rows are built off-DOM and attached in
+    // one operation instead of one insert per row
+    const fresh = kl.showingEmpty;
+    kl.showingEmpty = false;
+    const target = fresh ? document.createDocumentFragment() : container;
+
+    const live = new Map();
+    let cursor = fresh ? null : container.firstChild;
+    for (const item of items) {
+        const key = uniqueKey(live, rows.key(item));
+        let row = kl.live.get(key);
+        if (row) {
+            kl.live.delete(key);
+        } else {
+            row = rows.create(item);
+        }
+        rows.update(row, item);
+
+        if (row.el === cursor) {
+            cursor = cursor.nextSibling;
+        } else {
+            target.insertBefore(row.el, cursor);
+        }
+        live.set(key, row);
+    }
+    for (const row of kl.live.values()) row.el.remove();
+    kl.live = live;
+    if (fresh) {
+        container.replaceChildren(target);
+        kl.shownEmpty = null;
+    }
+}
+
+// Virtualized lists: only rows inside the scroll viewport (plus overscan)
+// are kept in the DOM, so render cost does not grow with history length.
+const VLIST_OVERSCAN = 4;
+
+function createVirtualList(id, rowHeight, rows, emptyHtml, newestFirst = false) {
+    const vl = {
+        container: document.getElementById(id),
+        spacer: null,
+        rowHeight,
+        rows,  // same shape as keyed-list rows
+        live: new Map(),
+        emptyHtml,
+        newestFirst,  // render an append-ordered array back to front, without copying
+        items: [],
+        scrollPending: false,
+        // Geometry is recorded by the scroll and resize observers, so a render
+        // that runs after other cards' writes never forces a layout to read it
+        scrollTop: 0,
+        viewport: 0,
+    };
+    const scheduleRender = () => {
+        if (vl.scrollPending) return;
+        vl.scrollPending = true;
+        requestAnimationFrame(() => {
+            vl.scrollPending = false;
+            renderVirtualList(vl);
+        });
+    };
+    vl.container.addEventListener('scroll', () => {
+        vl.scrollTop = vl.container.scrollTop;
+        scheduleRender();
+    }, { passive: true });
+    if ('ResizeObserver' in window) {
+        new ResizeObserver(entries => {
+            const height = entries[entries.length - 1].contentRect.height;
+            if (height !== vl.viewport) {
+                vl.viewport = height;
+                scheduleRender();
+            }
+        }).observe(vl.container);
+    }
+    return vl;
+}
+
+function setVirtualItems(vl, items, emptyHtml) {
+    vl.items = items;
+    if (emptyHtml !== undefined) vl.emptyHtml = emptyHtml;
+    renderVirtualList(vl);
+}
+
+function renderVirtualList(vl) {
+    const { container, rowHeight, rows, items } = vl;
+
+    if (items.length === 0) {
+        vl.spacer = null;
+        vl.live.clear();
+        showEmpty(vl, vl.emptyHtml);
+        return;
+    }
+
+    if (!vl.spacer) {
+        vl.spacer = document.createElement('div');
+        vl.spacer.className = 'vlist-spacer';
+        container.replaceChildren(vl.spacer);
+        vl.shownEmpty = null;
+    }
+    vl.spacer.style.height = `${items.length * rowHeight}px`;
+
+    const viewport = vl.viewport || rowHeight * 10;
+    const start = Math.max(0, Math.floor(vl.scrollTop / rowHeight) - VLIST_OVERSCAN);
+    const end = Math.min(items.length, start + Math.ceil(viewport / rowHeight) + 2 * VLIST_OVERSCAN);
+
+    // Rows are absolutely positioned, so reused rows only need a new `top`
+    const live = new Map();
+    for (let i = start; i < end; i++) {
+        const item = vl.newestFirst ? items[items.length - 1 - i] : items[i];
+        const key = uniqueKey(live, rows.key(item));
+        let row = vl.live.get(key);
+        if (row) {
+            vl.live.delete(key);
+        } else {
+            row = rows.create(item);
+            row.el.classList.add('vlist-row');
+            row.el.style.height = `${rowHeight}px`;
+            vl.spacer.appendChild(row.el);
+        }
+        const top = i * rowHeight;
+        if (row.top !== top) {
+            row.top = top;
+            row.el.style.top = `${top}px`;
+        }
+        rows.update(row, item);
+        live.set(key, row);
+    }
+    for (const row of vl.live.values()) row.el.remove();
+    vl.live = live;
+}
+
+// Rows are cloned from <template> elements, so the HTML parser runs once
+// per row shape rather than once per row
+const templateRoots = new Map();
+
+function cloneTemplate(id) {
+    let root = templateRoots.get(id);
+    if (!root) {
+        root = document.getElementById(id).content.firstElementChild;
+        templateRoots.set(id, root);
+    }
+    return root.cloneNode(true);
+}
+
+const opportunityRows = {
+    key: opp => `${opp.timestamp}|${opp.market_id}|${opp.type}`,
+    create() {
+        const el = cloneTemplate('tplOpportunityRow');
+        const [type, details, time] = el.children;
+        return { el, type, market: details.children[0], edge: details.children[1], time };
+    },
+    update(row, opp) {
+        const typeClass = opp.type?.includes('bundle') ? 
+            (opp.type.includes('long') ? 'bundle-long' : 'bundle-short') : 'mm';
+        setClass(row.type, `opportunity-type ${typeClass}`);
+        setText(row.type, opp.type?.replace('_', ' ').toUpperCase() || 'UNKNOWN');
+        setText(row.market, opp.market_id || 'Unknown');
+        setText(row.edge, `Edge: ${((opp.edge || 0) * 100).toFixed(2)}%`);
+        setText(row.time, formatTime(opp.timestamp_ms ?? opp.timestamp));
+    },
+};
+
+const activityRows = {
+    key: act => `${act.activityType}|${act.timestamp}|${act.market_id || ''}|${act.action || act.side || ''}`,
+    create() {
+        const el = cloneTemplate('tplActivityRow');
+        const [icon, content] = el.children;
+        return { el, icon, message: content.children[0], time: content.children[1] };
+    },
+    update(row, act) {
+        if (act.activityType === 'trade') {
+            setClass(row.icon, 'activity-icon fill');
+            setText(row.icon, '✓');
+            setText(row.message, `${act.side} ${(act.size || 0).toFixed(2)} @ ${(act.price || 0).toFixed(4)}`);
+        } else {
+            setClass(row.icon, 'activity-icon signal');
+            setText(row.icon, '→');
+            setText(row.message, `${act.action || 'Signal'}: ${act.market_id || ''}`);
+        }
+        setText(row.time, formatTime(act.timestamp_ms ?? act.timestamp));
+    },
+};
+
+const marketRows = {
+    key: item => item.pair
+        ? `pair|${item.pair.poly_question}|${item.pair.kalshi_title}`
+        : `market|${item.id}`,
+    create(item) {
+        if (item.pair) {
+            const el = cloneTemplate('tplPairRow');
+            const [question, prices] = el.children;
+            const [poly, kalshi, similarity] = prices.children;
+            return { el, badge: question.children[0], title: question.children[1], poly, kalshi, similarity };
+        }
+        const el = cloneTemplate('tplMarketRow');
+        const [name, price, spread] = el.children;
+        return { el, name, price, spread };
+    },
+    update(row, item) {
+        if (item.pair) {
+            const pair = item.pair;
+            setText(row.badge, detectCategory(pair.poly_question || pair.kalshi_title || ''));
+            setText(row.title, truncate(pair.poly_question || pair.kalshi_title || 'Market', 50));
+            setText(row.poly, `P: ${pair.poly_yes ? formatPct(pair.poly_yes) : '--'}`);
+            setText(row.kalshi, `K: ${pair.kalshi_yes ? formatPct(pair.kalshi_yes) : '--'}`);
+            setText(row.similarity, `${((pair.similarity || 0) * 100).toFixed(0)}% match`);
+            return;
+        }
+        const m = state.markets[item.id];
+        const bid = m.best_bid_yes || 0;
+        const ask = m.best_ask_yes || 0;
+        setText(row.name, m.question || item.id);
+        setText(row.price, `${bid.toFixed(2)}/${ask.toFixed(2)}`);
+        setText(row.spread, `${((ask - bid) * 100).toFixed(1)}c`);
+    },
+};
+
+const pairCardRows = {
+    key: pair => pair.hasArb
+        ? `arb|${pair.market_pair || pair.poly_question}`
+        : `pair|${pair.poly_question || pair.kalshi_title}`,
+    create() {
+        const el = cloneTemplate('tplPairCard');
+        const [header, title, platforms, footer] = el.children;
+        const prices = box => box.children[1].children;
+        const [polyYes, , polyNo] = prices(platforms.children[0]);
+        const [kalshiYes, , kalshiNo] = prices(platforms.children[1]);
+        return {
+            el, title, polyYes, polyNo, kalshiYes, kalshiNo,
+            badge: header.children[0], arb: header.children[1],
+            similarity: footer.children[0], edge: footer.children[1],
+        };
+    },
+    update(row, pair) {
+        const hasArb = pair.hasArb || false;
+        const edgePct = (pair.edge_pct || 0) * 100;
+        setClass(row.el, hasArb ? 'pair-card has-arb' : 'pair-card');
+        setText(row.badge, detectCategory(pair.poly_question || pair.market_pair || ''));
+        row.arb.hidden = !hasArb;
+        setText(row.title, truncate(pair.poly_question || pair.kalshi_title || pair.market_pair || 'Market', 60));
+        setText(row.polyYes, formatPct(pair.poly_yes || pair.buy_price));
+        setText(row.polyNo, formatPct(pair.poly_no || (1 - (pair.buy_price || 0.5))));
+        setText(row.kalshiYes, formatPct(pair.kalshi_yes || pair.sell_price));
+        setText(row.kalshiNo, formatPct(pair.kalshi_no || (1 - (pair.sell_price || 0.5))));
+        setText(row.similarity, `Similarity: ${((pair.similarity || 0.8) * 100).toFixed(0)}%`);
+        setClass(row.edge, edgePct > 1 ? 'pair-edge positive' : 'pair-edge negative');
+        setText(row.edge, hasArb ? `Edge: +${edgePct.toFixed(1)}%` : 'No arb');
+    },
+};
+
+const timingRows = {
+    key: item => `${item.time}|${item.type}`,
+    create() {
+        const el = cloneTemplate('tplTimingRow');
+        const [label, duration] = el.children;
+        return { el, type: label.children[0], executed: label.children[1], duration };
+    },
+    update(row, item) {
+        setText(row.type, item.type?.replace('_', ' ') || 'unknown');
+        setText(row.executed, item.executed ? '✓' : '');
+        setClass(row.duration, durationClass(TIMING_ROW_CLASSES, item.duration_ms));
+        setText(row.duration, formatDuration(item.duration_ms));
+    },
+};
+
+const FEED_PLATFORM_CLASSES = { 'cross-platform': 'cross-platform', polymarket: 'polymarket' };
+
+const feedRows = {
+    key: opp => `${opp.type}|${opp.title}|${opp.marketInfo}`,
+    create() {
+        const el = cloneTemplate('tplFeedCard');
+        const card = el.firstElementChild;
+        const [header, title, info, platforms] = card.children;
+        const [badge, cross] = header.children[0].children;
+        const platformParts = row => {
+            const [name, price] = row.children;
+            const [icon, label, arrow] = name.children;
+            return { icon, label, arrow, price };
+        };
+        return {
+            el, card, badge, cross, edge: header.children[1], title,
+            info: info.children[1], active: info.children[2],
+            p1: platformParts(platforms.children[0]),
+            p2: platformParts(platforms.children[1]),
+        };
+    },
+    update(row, opp) {
+        const hasArb = opp.edge > 0;
+        setClass(row.card, `opp-card ${FEED_PLATFORM_CLASSES[opp.type] || 'kalshi'}`);
+        setClass(row.badge, `opp-badge ${getBadgeClass(opp.category)}`);
+        setText(row.badge, opp.category);
+        row.cross.hidden = opp.type !== 'cross-platform';
+        if (hasArb) {
+            setClass(row.edge, 'opp-edge');
+            setText(row.edge, `+${(opp.edge * 100).toFixed(2)}%`);
+        } else {
+            setClass(row.edge, 'opp-similarity');
+            setText(row.edge, opp.similarity ? `${(opp.similarity * 100).toFixed(0)}% match` : '');
+        }
+        setText(row.title, truncate(opp.title, 70));
+        setText(row.info, opp.marketInfo);
+        row.active.hidden = !hasArb;
+        updateFeedPlatform(row.p1, opp.platform1, hasArb, 'buy', name => name.includes('poly') ? 'poly' : 'kalshi');
+        updateFeedPlatform(row.p2, opp.platform2, hasArb, 'sell', name => name.includes('kalshi') ? 'kalshi' : 'poly');
+    },
+};
+
+function updateFeedPlatform(parts, platform, hasArb, side, iconClass) {
+    setClass(parts.icon, `opp-platform-icon ${iconClass(platform.name.toLowerCase())}`);
+    setText(parts.icon, platform.name.charAt(0));
+    setText(parts.label, platform.name);
+    parts.arrow.hidden = !hasArb;
+    setClass(parts.price, hasArb ? `opp-platform-price ${side}` : 'opp-platform-price');
+    setText(parts.price, formatPct(platform.price));
+}
+
+const opportunityVList = createVirtualList('opportunityList', 64, opportunityRows,
+    '<div class="empty-state"><div class="empty-icon">📊</div><div>Waiting for opportunities...</div></div>', true);
+const activityVList = createVirtualList('activityList', 52, activityRows,
+    '<div class="empty-state"><div class="empty-icon">📝</div><div>No activity yet...</div></div>');
+const marketVList = createVirtualList('marketList', 48, marketRows,
+    '<div class="empty-state"><div class="empty-icon">📈</div><div>Loading markets...</div></div>');
+// Feed cards have a fixed height (titles clamp to one line) so they can
+// be windowed too; the empty state is the markup the page ships with
+const FEED_CARD_HEIGHT = 224;
+const feedVList = createVirtualList('opportunitiesFeed', FEED_CARD_HEIGHT, feedRows,
+    document.getElementById('opportunitiesFeed').innerHTML);
+// Not every layout has the matched pairs grid
+const pairCardList = document.getElementById('matchedPairsGrid')
+    ? createKeyedList('matchedPairsGrid', pairCardRows, '')
+    : null;
+const timingList = createKeyedList('recentTimings', timingRows,
+    '<div style="text-align: center; color: var(--text-secondary); padding: 1rem;">Waiting for opportunity data...</div>');
+
+// Elements touched on every render are looked up once, not per update
+const els = Object.freeze(Object.fromEntries([
+    'connectionStatus', 'statusDot', 'statusText', 'modeBadge', 'totalPnl',
+    'realizedPnl', 'exposure', 'openOrders', 'opportunityCount', 'winRate',
+    'oppRefresh', 'riskExposure', 'exposureBar', 'riskDailyPnl', 'dailyPnlBar',
+    'riskDrawdown', 'drawdownBar', 'killSwitch', 'timingCount', 'avgDuration',
+    'minDuration', 'maxDuration', 'activeOpps', 'under100ms', 'under500ms',
+    'under1s', 'over1s', 'totalMarkets', 'marketsWithData', 'marketsWithPrices',
+    'orderbookUpdates', 'updatesPerMin', 'cycleTime', 'streamStatus', 'uptime',
+    'crossPlatformStatus', 'polymarketMarkets', 'kalshiMarkets', 'matchedPairs', 'kalshiOrderbooks',
+    'polymarketStatus', 'kalshiStatus', 'matchingStatus', 'kalshiObStatus', 'matchingProgressContainer',
+    'matchingProgressBar', 'matchingProgressText', 'matchingStats', 'crossOpportunities', 'arbStatus',
+    'oppCount',
+].map(id => [id, document.getElementById(id)])));
+
+function connect() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    // Ask for MessagePack frames; servers without msgpack send JSON frames
+    const params = new URLSearchParams({ format: 'msgpack' });
+    // Large frames are gzipped once on the server for every client
+    if (typeof DecompressionStream !== 'undefined') params.set('compress', 'gzip');
+    if (dashboardToken) params.set('token', dashboardToken);
+    if (resumeFrom) {
+        params.set('session', resumeFrom.session);
+        params.set('since', resumeFrom.seq);
+    }
+    ws = new WebSocket(`${protocol}//${window.location.host}/ws?${params}`);
+    ws.binaryType = 'arraybuffer';
+
+    ws.onopen = () => {
+        console.log('WebSocket connected');
+        setText(els.connectionStatus, '🟢 Connected');
+        setClass(els.connectionStatus, 'connection-status connected');
+        // Only reset the backoff once the link has stayed up, so a
+        // flapping server doesn't get hammered at the shortest delay
+        stableTimer = setTimeout(() => { reconnectAttempts = 0; }, STABLE_CONNECTION_MS);
+    };
+
+    ws.onclose = () => {
+        console.log('WebSocket disconnected');
+        setText(els.connectionStatus, '🔴 Disconnected');
+        setClass(els.connectionStatus, 'connection-status disconnected');
+        clearTimeout(stableTimer);
+        setTimeout(reconnect, jitter(BACKOFF[Math.min(reconnectAttempts, BACKOFF.length - 1)]));
+        reconnectAttempts++;
+    };
+
+    ws.onerror = (error) => {
+        console.error('WebSocket error:', error);
+    };
+
+    ws.onmessage = (event) => {
+        // Gunzipping is async: chain every frame so they apply in order
+        inbound = inbound
+            .then(() => decodeMessage(event.data))
+            .then(handleMessage)
+            .catch(error => console.error('Bad frame:', error));
+    };
+}
+
+let inbound = Promise.resolve();
+
+function decodeMessage(data) {
+    if (typeof data === 'string') return JSON.parse(data);
+    const bytes = new Uint8Array(data);
+    return bytes[0] === 0x1f && bytes[1] === 0x8b
+        ? gunzip(bytes).then(decodeFrame)
+        : decodeFrame(bytes);
+}
+
+function gunzip(bytes) {
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).arrayBuffer().then(buffer => new Uint8Array(buffer));
+}
+
+function handleMessage(msg) {
+    if (msg.type === 'initial') {
+        resumeFrom = msg.session ? { session: msg.session, seq: msg.seq } : null;
+    } else if (msg.seq !== undefined && resumeFrom) {
+        resumeFrom.seq = msg.seq;
+    }
+    if (msg.type === 'batch') {
+        // Server coalesced a burst into one frame: apply all, render once
+        if (msg.items.map(applyMessage).some(Boolean)) scheduleUpdate();
+    } else if (applyMessage(msg)) {
+        scheduleUpdate();
+    }
+}
+
+// Binary frames carry UTF-8 JSON, or MessagePack when the server has it.
+// A JSON frame always starts with '{'; MessagePack encodes that byte as
+// a bare integer, never as a whole message, so it tells the two apart.
+function decodeFrame(bytes) {
+    return bytes[0] === 0x7b
+        ? JSON.parse(utf8Decoder.decode(bytes))
+        : decodeMsgpack(bytes);
+}
+
+// Minimal MessagePack decoder for binary frames. Covers every type the
+// server's msgpack.packb emits for JSON-shaped payloads (no ext types).
+const utf8Decoder = new TextDecoder();
+
+function decodeMsgpack(bytes) {
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    let pos = 0;
+
+    function str(len) {
+        pos += len;
+        return utf8Decoder.decode(bytes.subarray(pos - len, pos));
+    }
+    function bin(len) {
+        pos += len;
+        return bytes.slice(pos - len, pos);
+    }
+    function arr(len) {
+        const out = new Array(len);
+        for (let i = 0; i < len; i++) out[i] = read();
+        return out;
+    }
+    function map(len) {
+        const out = {};
+        for (let i = 0; i < len; i++) {
+            const key = read();
+            out[key] = read();
+        }
+        return out;
+    }
+    function num(getter, size) {
+        const v = view[getter](pos);
+        pos += size;
+        return v;
+    }
+
+    function read() {
+        const b = bytes[pos++];
+        if (b <= 0x7f) return b;
+        if (b >= 0xe0) return b - 0x100;
+        if (b >= 0xa0 && b <= 0xbf) return str(b & 0x1f);
+        if (b >= 0x90 && b <= 0x9f) return arr(b & 0x0f);
+        if (b >= 0x80 && b <= 0x8f) return map(b & 0x0f);
+        switch (b) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return bin(num('getUint8', 1));
+            case 0xc5: return bin(num('getUint16', 2));
+            case 0xc6: return bin(num('getUint32', 4));
+            case 0xca: return num('getFloat32', 4);
+            case 0xcb: return num('getFloat64', 8);
+            case 0xcc: return num('getUint8', 1);
+            case 0xcd: return num('getUint16', 2);
+            case 0xce: return num('getUint32', 4);
+            case 0xcf: return Number(num('getBigUint64', 8));
+            case 0xd0: return num('getInt8', 1);
+            case 0xd1: return num('getInt16', 2);
+            case 0xd2: return num('getInt32', 4);
+            case 0xd3: return Number(num('getBigInt64', 8));
+            case 0xd9: return str(num('getUint8', 1));
+            case 0xda: return str(num('getUint16', 2));
+            case 0xdb: return str(num('getUint32', 4));
+            case 0xdc: return arr(num('getUint16', 2));
+            case 0xdd: return arr(num('getUint32', 4));
+            case 0xde: return map(num('getUint16', 2));
+            case 0xdf: return map(num('getUint32', 4));
+        }
+        throw new Error(`Unsupported MessagePack type 0x${b.toString(16)}`);
+    }
+
+    return read();
+}
+
+// Apply a message to local state without rendering; returns false if ignored
+function applyMessage(msg) {
+    if (msg.type === 'initial' || msg.type === 'update') {
+        state = msg.data || msg;
+        markAllDirty();
+    } else if (msg.type === 'patch') {
+        applyPatch(msg.ops || []);
+    } else if (msg.type === 'opportunity') {
+        addOpportunity(msg.data);
+    } else if (msg.type === 'activity') {
+        addActivity(msg.data);
+    } else {
+        return false;
+    }
+    return true;
+}
+
+// Apply JSON-Patch style replace/remove ops sent by the server
+function applyPatch(ops) {
+    for (const op of ops) {
+        const path = op.path.split('/').slice(1)
+            .map(part => part.replace(/~1/g, '/').replace(/~0/g, '~'));
+        let target = state;
+        for (const part of path.slice(0, -1)) {
+            if (target[part] === null || typeof target[part] !== 'object') target[part] = {};
+            target = target[part];
+        }
+        const last = path[path.length - 1];
+        // A market added or removed changes the market row list
+        if (path[0] === 'markets' && (op.op === 'remove' || !(last in target))) marketItemsCache = null;
+        if (op.op === 'remove') {
+            delete target[last];
+        } else {
+            target[last] = op.value;
+        }
+        markDirty(path[0]);
+    }
+}
+
+function reconnect() {
+    if (ws && ws.readyState === WebSocket.OPEN) return;
+    connect();
+}
+
+// Coalesce renders: bursts of messages produce at most one repaint per frame
+let pendingFrame = 0;
+
+function scheduleUpdate() {
+    if (pendingFrame) return;
+    pendingFrame = requestAnimationFrame(() => {
+        pendingFrame = 0;
+        updateDashboard();
+    });
+}
+
+// Renderers in paint order, and the top-level state keys each one reads
+const RENDERERS = [
+    updateStatus, updateMetrics, updateOpportunities, updateActivity, updateRisk,
+    updateTiming, updateOperational, updateCrossPlatform, updateMarkets,
+];
+const SECTION_RENDERERS = {
+    is_running: [updateStatus],
+    mode: [updateStatus],
+    portfolio: [updateMetrics],
+    orders: [updateMetrics],
+    opportunities: [updateMetrics, updateOpportunities, updateCrossPlatform],
+    last_update: [updateOpportunities],
+    signals: [updateActivity],
+    trades: [updateActivity],
+    risk: [updateRisk],
+    timing: [updateTiming],
+    operational: [updateOperational],
+    uptime_seconds: [updateOperational],
+    cross_platform: [updateOperational, updateCrossPlatform, updateMarkets],
+    markets: [updateMarkets],
+};
+const dirtyRenderers = new Set(RENDERERS);
+
+function markDirty(section) {
+    for (const render of SECTION_RENDERERS[section] || []) dirtyRenderers.add(render);
+}
+
+function markAllDirty() {
+    for (const render of RENDERERS) dirtyRenderers.add(render);
+}
+
+// Cards each renderer draws into (by an element inside them). Renderers
+// whose cards are all off-screen stay dirty and run once one scrolls
+// into view; unlisted renderers (the header) always run.
+const RENDERER_CARDS = new Map([
+    [updateMetrics, ['totalPnl']],
+    [updateOpportunities, ['opportunityList']],
+    [updateActivity, ['activityList']],
+    [updateRisk, ['riskExposure']],
+    [updateTiming, ['timingCount']],
+    [updateOperational, ['totalMarkets']],
+    [updateCrossPlatform, ['crossPlatformStatus', 'opportunitiesFeed']],
+    [updateMarkets, ['marketList']],
+].map(([render, ids]) => [render, ids.map(id => document.getElementById(id).closest('section'))]));
+const hiddenCards = new Set();
+
+if ('IntersectionObserver' in window) {
+    const cardObserver = new IntersectionObserver(entries => {
+        let revealed = false;
+        for (const entry of entries) {
+            if (entry.isIntersecting) {
+                revealed = hiddenCards.delete(entry.target) || revealed;
+            } else {
+                hiddenCards.add(entry.target);
+            }
+        }
+        if (revealed && dirtyRenderers.size) scheduleUpdate();
+    });
+    for (const cards of RENDERER_CARDS.values()) cards.forEach(card => cardObserver.observe(card));
+}
+
+function isOnScreen(render) {
+    const cards = RENDERER_CARDS.get(render);
+    return !cards || cards.some(card => !hiddenCards.has(card));
+}
+
+function updateDashboard() {
+    // Only re-render sections whose state changed since the last frame
+    // and that are currently visible
+    for (const render of RENDERERS) {
+        if (!dirtyRenderers.has(render) || !isOnScreen(render)) continue;
+        render();
+        dirtyRenderers.delete(render);
+    }
+}
+
+function updateStatus() {
+    const statusDot = els.statusDot;
+    const statusText = els.statusText;
+    if (state.is_running) {
+        setClass(statusDot, 'status-dot running');
+        setText(statusText, 'Running');
+    } else {
+        setClass(statusDot, 'status-dot stopped');
+        setText(statusText, 'Stopped');
+    }
+
+    // Mode
+    const modeBadge = els.modeBadge;
+    if (state.mode === 'live') {
+        setClass(modeBadge, 'mode-badge live');
+        setText(modeBadge, 'LIVE');
+    } else {
+        setClass(modeBadge, 'mode-badge dry-run');
+        setText(modeBadge, 'DRY RUN');
+    }
+}
+
+// Indexed by sign so no class string is built per tick
+const METRIC_CLASSES = ['metric-value negative', 'metric-value neutral', 'metric-value positive'];
+
+function updateMetrics() {
+    const portfolio = state.portfolio || {};
+    const pnl = portfolio.pnl || {};
+    const stats = state.stats || {};
+
+    const totalPnl = pnl.total_pnl || 0;
+    const realizedPnl = pnl.realized_pnl || 0;
+    const exposure = portfolio.total_exposure || 0;
+    const winRate = (portfolio.win_rate || 0) * 100;
+
+    setText(els.totalPnl, formatCurrency(totalPnl));
+    setClass(els.totalPnl, METRIC_CLASSES[(totalPnl >= 0) * 2]);
+
+    setText(els.realizedPnl, formatCurrency(realizedPnl));
+    setClass(els.realizedPnl, METRIC_CLASSES[(realizedPnl >= 0) * 2]);
+
+    setText(els.exposure, formatCurrency(exposure));
+    setText(els.openOrders, (state.orders || []).length);
+    setText(els.opportunityCount, (state.opportunities || []).length);
+    setText(els.winRate, formatPct1(winRate));
+    setClass(els.winRate, METRIC_CLASSES[(winRate > 0) + (winRate >= 50)]);
+}
+
+function updateOpportunities() {
+    const opportunities = state.opportunities || [];
+
+    // Rendered newest first; an append only materializes one new row
+    setVirtualItems(opportunityVList, opportunities);
+
+    if (opportunities.length === 0) return;
+    setText(els.oppRefresh, `Last: ${formatClock(state.last_update)}`);
+}
+
+function stampOf(item) {
+    return item.timestamp_ms ?? item.timestamp;
+}
+
+function updateActivity() {
+    const signals = state.signals || [];
+    const trades = state.trades || [];
+
+    // Both arrays are append-ordered by server timestamp, so merging
+    // from the tails gives newest-first in O(S+T) without sorting.
+    // Items carry epoch ms; the ISO-8601 UTC fallback compares as strings.
+    const activities = new Array(signals.length + trades.length);
+    let i = signals.length - 1;
+    let j = trades.length - 1;
+    let k = 0;
+    while (i >= 0 || j >= 0) {
+        if (j < 0 || (i >= 0 && stampOf(signals[i]) >= stampOf(trades[j]))) {
+            activities[k++] = {...signals[i--], activityType: 'signal'};
+        } else {
+            activities[k++] = {...trades[j--], activityType: 'trade'};
+        }
+    }
+
+    setVirtualItems(activityVList, activities);
+}
+
+// Whole class strings per level, indexed by how many thresholds a bar has
+// crossed, so the class is never rebuilt from a template each render
+const RISK_BAR_CLASSES = ['risk-bar-fill safe', 'risk-bar-fill warning', 'risk-bar-fill danger'];
+
+function riskBarClass(pct, warnAt) {
+    return RISK_BAR_CLASSES[(pct >= warnAt) + (pct >= 80)];
+}
+
+function updateRisk() {
+    const risk = state.risk || {};
+
+    const exposure = risk.global_exposure || 0;
+    const maxExposure = risk.max_global_exposure || 5000;
+    const exposurePct = (exposure / maxExposure) * 100;
+
+    setText(els.riskExposure, `$${exposure.toFixed(0)} / $${formatCount(maxExposure)}`);
+    setBarFill(els.exposureBar, exposurePct);
+    setClass(els.exposureBar, riskBarClass(exposurePct, 60));
+
+    const dailyPnl = risk.daily_pnl || 0;
+    const maxLoss = risk.max_daily_loss || 500;
+    const dailyPnlPct = Math.abs(Math.min(dailyPnl, 0)) / maxLoss * 100;
+
+    setText(els.riskDailyPnl, `$${dailyPnl.toFixed(2)} / -$${maxLoss}`);
+    setBarFill(els.dailyPnlBar, dailyPnlPct);
+    setClass(els.dailyPnlBar, riskBarClass(dailyPnlPct, 50));
+
+    const drawdown = (risk.current_drawdown_pct || 0);
+    const maxDrawdown = (risk.max_drawdown_pct || 10);
+    const drawdownPct = (drawdown / maxDrawdown) * 100;
+
+    setText(els.riskDrawdown, `${formatPct1(drawdown)} / ${maxDrawdown}%`);
+    setBarFill(els.drawdownBar, drawdownPct);
+    setClass(els.drawdownBar, riskBarClass(drawdownPct, 50));
+
+    els.killSwitch.style.display = risk.kill_switch_triggered ? 'block' : 'none';
+}
+
+function updateTiming() {
+    const timing = state.timing || {};
+
+    // Update count
+    setText(els.timingCount, `${timing.total_tracked || 0} tracked`);
+
+    // Update main stats
+    const avgDuration = timing.avg_duration_ms;
+    if (avgDuration !== undefined && avgDuration !== null) {
+        setText(els.avgDuration, formatDuration(avgDuration));
+        setClass(els.avgDuration, durationClass(TIMING_STAT_CLASSES, avgDuration));
+    }
+
+    const minDuration = timing.min_duration_ms;
+    if (minDuration !== undefined && minDuration !== null) {
+        setText(els.minDuration, formatDuration(minDuration));
+        setClass(els.minDuration, durationClass(TIMING_STAT_CLASSES, minDuration));
+    }
+
+    const maxDuration = timing.max_duration_ms;
+    if (maxDuration !== undefined && maxDuration !== null) {
+        setText(els.maxDuration, formatDuration(maxDuration));
+        setClass(els.maxDuration, durationClass(TIMING_STAT_CLASSES, maxDuration));
+    }
+
+    setText(els.activeOpps, timing.active_opportunities || 0);
+
+    // Update buckets
+    setText(els.under100ms, timing.under_100ms || 0);
+    setText(els.under500ms, timing.under_500ms || 0);
+    setText(els.under1s, timing.under_1s || 0);
+    setText(els.over1s, timing.over_1s || 0);
+
+    // Update recent timings
+    const recent = timing.recent_durations || [];
+    renderKeyedList(timingList, recent.slice().reverse());
+}
+
+// Formatters run for every row on every render with mostly repeated
+// inputs, so results are kept in a small bounded cache.
+const FORMAT_CACHE_LIMIT = 512;
+
+function memoizeFormatter(fn, keyOf = value => value) {
+    const cache = new Map();
+    return value => {
+        const key = keyOf(value);
+        let out = cache.get(key);
+        if (out === undefined) {
+            out = fn(value);
+            if (cache.size >= FORMAT_CACHE_LIMIT) cache.clear();
+            cache.set(key, out);
+        }
+        return out;
+    };
+}
+
+const formatDuration = memoizeFormatter(ms => {
+    if (ms === undefined || ms === null) return '--';
+    if (ms < 1000) return `${Math.round(ms)}ms`;
+    return `${(ms / 1000).toFixed(1)}s`;
+});
+
+const TIMING_ROW_CLASSES = ['timing-duration fast', 'timing-duration medium', 'timing-duration slow'];
+const TIMING_STAT_CLASSES = ['timing-stat-value fast', 'timing-stat-value medium', 'timing-stat-value slow'];
+
+function durationClass(classes, ms) {
+    return classes[(ms >= 200) + (ms >= 1000)];
+}
+
+const RATE_SAMPLE_MS = 1000;
+const RATE_EMA_ALPHA = 0.2;  // weight of the newest sample in the smoothed rate
+let lastUpdateCount = 0;
+let lastUpdateTime = 0;
+let updatesPerMinEma = 0;
+
+// The combined market count is two coloured spans, built once per element
+// and re-texted afterwards instead of re-parsed from HTML
+function marketCountSplit(el) {
+    if (!el._split) {
+        const poly = document.createElement('span');
+        poly.style.color = '#8b5cf6';
+        const kalshi = document.createElement('span');
+        kalshi.style.color = '#f7931a';
+        el._split = { poly, kalshi, nodes: [poly, document.createTextNode(' + '), kalshi] };
+    }
+    return el._split;
+}
+
+function updateOperational() {
+    const op = state.operational || {};
+    const cp = state.cross_platform || {};
+
+    // Show combined market count (Polymarket + Kalshi)
+    const polyCount = cp.polymarket_markets || 0;
+    const kalshiCount = cp.kalshi_markets || 0;
+    const totalCombined = polyCount + kalshiCount;
+
+    // Update stats - show combined if cross-platform is enabled
+    const totalEl = els.totalMarkets;
+    if (cp.enabled && totalCombined > 0) {
+        const split = marketCountSplit(totalEl);
+        if (totalEl.firstChild !== split.poly) {
+            totalEl.replaceChildren(...split.nodes);
+            totalEl._text = undefined;
+        }
+        setText(split.poly, formatCount(polyCount));
+        setText(split.kalshi, formatCount(kalshiCount));
+    } else {
+        setText(totalEl, op.total_markets || 0);
+    }
+    setText(els.marketsWithData, op.markets_with_orderbooks || 0);
+    setText(els.marketsWithPrices, op.markets_with_prices || 0);
+    setText(els.orderbookUpdates, formatNumber(op.orderbook_updates || 0));
+
+    // Rates are only meaningful over a window, so sample at most once
+    // per second no matter how often updates arrive
+    const now = Date.now();
+    if (now - lastUpdateTime >= RATE_SAMPLE_MS) {
+        const timeDiff = (now - lastUpdateTime) / 1000; // seconds
+        const updateDiff = (op.orderbook_updates || 0) - lastUpdateCount;
+
+        if (lastUpdateCount > 0) {
+            // Smooth per-second samples so bursty scans don't make the rate jump
+            const rate = (updateDiff / timeDiff) * 60;
+            updatesPerMinEma = updatesPerMinEma
+                ? RATE_EMA_ALPHA * rate + (1 - RATE_EMA_ALPHA) * updatesPerMinEma
+                : rate;
+            setText(els.updatesPerMin, Math.round(updatesPerMinEma));
+        }
+
+        lastUpdateCount = op.orderbook_updates || 0;
+        lastUpdateTime = now;
+
+        // Estimate cycle time (time to check all markets)
+        const totalMarkets = op.total_markets || 1;
+        const updatesPerSec = (op.orderbook_updates || 0) / Math.max(state.uptime_seconds || 1, 1);
+        if (updatesPerSec > 0) {
+            const cycleSeconds = totalMarkets / updatesPerSec;
+            setText(els.cycleTime, formatCycleTime(cycleSeconds));
+        }
+    }
+
+    // Stream status
+    const statusEl = els.streamStatus;
+    if (op.is_streaming) {
+        setText(statusEl, '● Streaming');
+        statusEl.style.color = 'var(--accent-green)';
+    } else {
+        setText(statusEl, '○ Stopped');
+        statusEl.style.color = 'var(--accent-red)';
+    }
+
+    // Uptime
+    if (state.uptime_seconds) {
+        setText(els.uptime, formatUptime(state.uptime_seconds));
+    }
+}
+
+// One shared formatter: toLocaleString() builds a new one on every call
+const COUNT_FORMAT = new Intl.NumberFormat('en-US');
+
+function formatCount(num) {
+    return COUNT_FORMAT.format(num);
+}
+
+const formatNumber = memoizeFormatter(num => {
+    if (num >= 1000000) return (num / 1000000).toFixed(1) + 'M';
+    if (num >= 1000) return (num / 1000).toFixed(1) + 'K';
+    return num.toString();
+});
+
+const formatCycleTime = memoizeFormatter(seconds => {
+    if (seconds < 60) return Math.round(seconds) + 's';
+    if (seconds < 3600) return Math.round(seconds / 60) + 'm';
+    return (seconds / 3600).toFixed(1) + 'h';
+});
+
+function formatUptime(seconds) {
+    const hrs = Math.floor(seconds / 3600);
+    const mins = Math.floor((seconds % 3600) / 60);
+    const secs = Math.floor(seconds % 60);
+    return `${hrs.toString().padStart(2, '0')}:${mins.toString().padStart(2, '0')}:${secs.toString().padStart(2, '0')}`;
+}
+
+// Shared stand-in for missing arrays, so "no data" keeps a stable identity
+const NO_ITEMS = Object.freeze([]);
+
+// Source arrays behind the matched pair cards currently rendered
+let pairSources = null;
+
+function updateCrossPlatform() {
+    const cp = state.cross_platform || {};
+
+    // Update status badge
+    const statusEl = els.crossPlatformStatus;
+    if (cp.enabled) {
+        setText(statusEl, 'ACTIVE');
+        statusEl.style.background = 'linear-gradient(135deg, #00ff88, #00cc66)';
+    } else {
+        setText(statusEl, 'DISABLED');
+        statusEl.style.background = 'linear-gradient(135deg, #666, #444)';
+    }
+
+    // Update stats
+    const polyCount = cp.polymarket_markets || 0;
+    const kalshiCount = cp.kalshi_markets || 0;
+    const matchedCount = cp.matched_pairs || 0;
+    const kalshiObs = cp.kalshi_orderbooks || 0;
+
+    setText(els.polymarketMarkets, formatCount(polyCount));
+    setText(els.kalshiMarkets, formatCount(kalshiCount));
+    setText(els.matchedPairs, matchedCount);
+    if (els.kalshiOrderbooks) setText(els.kalshiOrderbooks, kalshiObs);
+
+    // Update status indicators with loading animation
+    const polyStatus = els.polymarketStatus;
+    const kalshiStatus = els.kalshiStatus;
+
+    // Polymarket status
+    if (polyCount >= 5000) {
+        setText(polyStatus, '✓ Loaded');
+        setClass(polyStatus, 'platform-stat-status ready');
+    } else if (polyCount > 0) {
+        setText(polyStatus, `⏳ ${formatCount(polyCount)}...`);
+        setClass(polyStatus, 'platform-stat-status loading');
+    } else {
+        setText(polyStatus, '⏳ Loading...');
+        setClass(polyStatus, 'platform-stat-status loading');
+    }
+
+    // Kalshi status
+    if (kalshiCount >= 5000) {
+        setText(kalshiStatus, '✓ Loaded');
+        setClass(kalshiStatus, 'platform-stat-status ready');
+    } else if (kalshiCount > 0) {
+        setText(kalshiStatus, `⏳ ${formatCount(kalshiCount)}...`);
+        setClass(kalshiStatus, 'platform-stat-status loading');
+    } else {
+        setText(kalshiStatus, '⏳ Loading...');
+        setClass(kalshiStatus, 'platform-stat-status loading');
+    }
+
+    const matchStatus = els.matchingStatus;
+    const kalshiObStatus = els.kalshiObStatus;
+
+    const matchingStatus = cp.matching_status || 'idle';
+    const matchingProgress = cp.matching_progress || 0;
+    const matchingChecked = cp.matching_checked || 0;
+    const matchingTotal = cp.matching_total || 0;
+
+    // Update progress bar
+    const progressContainer = els.matchingProgressContainer;
+    const progressBar = els.matchingProgressBar;
+    const progressText = els.matchingProgressText;
+    const matchingStatsEl = els.matchingStats;
+
+    if (matchingStatus === 'matching' || matchingStatus === 'starting') {
+        progressContainer.style.display = 'block';
+        setBarFill(progressBar, matchingProgress);
+        setText(progressText, `${matchingProgress}%`);
+        setText(matchingStatsEl, `Checked: ${formatCount(matchingChecked)} / ${formatCount(matchingTotal)} | Found: ${matchedCount} matches`);
+        setText(matchStatus, `🔍 ${matchingProgress}%`);
+        setClass(matchStatus, 'platform-stat-status scanning');
+    } else if (matchingStatus === 'complete') {
+        progressContainer.style.display = 'none';
+        setText(matchStatus, `✓ ${matchedCount} pairs`);
+        setClass(matchStatus, 'platform-stat-status ready');
+    } else if (polyCount > 0 && kalshiCount > 0) {
+        progressContainer.style.display = 'none';
+        setText(matchStatus, '⏳ Starting...');
+        setClass(matchStatus, 'platform-stat-status loading');
+    } else {
+        progressContainer.style.display = 'none';
+        setText(matchStatus, 'Waiting...');
+        setClass(matchStatus, 'platform-stat-status');
+    }
+
+    // The Kalshi orderbook card is not part of every layout
+    if (kalshiObStatus && kalshiObs > 0) {
+        setText(kalshiObStatus, `${kalshiObs} fetched`);
+        setClass(kalshiObStatus, 'platform-stat-status ready');
+    } else if (kalshiObStatus && matchedCount > 0) {
+        setText(kalshiObStatus, '⏳ Fetching...');
+        setClass(kalshiObStatus, 'platform-stat-status loading');
+    }
+
+    const crossOpps = cp.cross_opportunities || NO_ITEMS;
+    const matchedPairsData = cp.matched_pairs_data || NO_ITEMS;
+    setText(els.crossOpportunities, crossOpps.length);
+
+    // 🔥 Update Live Opportunities Feed
+    updateOpportunitiesFeed(state, cp);
+
+    // Update arb status
+    const arbStatus = els.arbStatus;
+    if (crossOpps.length > 0) {
+        setText(arbStatus, `🎯 ${crossOpps.length} found!`);
+        setClass(arbStatus, 'platform-stat-status ready');
+    } else if (matchedCount > 0) {
+        setText(arbStatus, '🔍 Scanning...');
+        setClass(arbStatus, 'platform-stat-status scanning');
+    } else {
+        setText(arbStatus, 'Waiting...');
+        setClass(arbStatus, 'platform-stat-status');
+    }
+
+    // Update matched pairs grid
+    if (!pairCardList) return;
+    if (!cp.enabled) {
+        renderKeyedList(pairCardList, [], '<div style="text-align: center; color: var(--text-secondary); padding: 2rem; grid-column: 1 / -1;"><div style="font-size: 2rem; margin-bottom: 0.5rem;">⏸️</div><div>Cross-platform mode disabled</div></div>');
+        return;
+    }
+
+    if (matchedPairsData.length === 0 && crossOpps.length === 0) {
+        renderKeyedList(pairCardList, [], `<div style="text-align: center; color: var(--text-secondary); padding: 2rem; grid-column: 1 / -1;">
+            <div style="font-size: 2rem; margin-bottom: 0.5rem;">🔍</div>
+            <div>Scanning ${formatCount(polyCount)} Polymarket & ${formatCount(kalshiCount)} Kalshi markets...</div>
+            <div style="font-size: 0.8rem; margin-top: 0.5rem;">Looking for matching NFL, NBA, Politics, Crypto predictions</div>
+        </div>`);
+        return;
+    }
+
+    // Patches only replace arrays that changed, so unchanged sources mean
+    // the cards on screen are already current
+    if (pairSources && pairSources[0] === crossOpps && pairSources[1] === matchedPairsData
+            && !pairCardList.showingEmpty) {
+        return;
+    }
+    pairSources = [crossOpps, matchedPairsData];
+
+    // Render matched pairs as cards (show opportunities first, then other pairs)
+    const pairs = crossOpps.slice(0, 12).map(o => ({...o, hasArb: true}));
+    for (let i = 0; pairs.length < 12 && i < matchedPairsData.length; i++) pairs.push(matchedPairsData[i]);
+    renderKeyedList(pairCardList, pairs);
+}
+
+// 🔥 Live Opportunities Feed Renderer
+function updateOpportunitiesFeed(state, cp) {
+    const oppCount = els.oppCount;
+
+    // Collect ALL opportunities: bundle arb, cross-platform, and potential matches
+    const allOpportunities = [];
+    let arbCount = 0;
+    const add = opp => {
+        if (opp.edge > 0) arbCount++;
+        allOpportunities.push(opp);
+    };
+
+    // 1. Add Polymarket bundle arbitrage opportunities
+    const bundleOpps = state.opportunities || [];
+    bundleOpps.forEach(opp => {
+        add({
+            type: 'polymarket',
+            title: opp.market_question || 'Bundle Arbitrage',
+            category: detectCategory(opp.market_question || ''),
+            edge: opp.net_edge_pct || opp.edge_pct || 0,
+            platform1: { name: 'Polymarket', price: opp.yes_price || 0.5, action: 'BUY YES' },
+            platform2: { name: 'Polymarket', price: opp.no_price || 0.5, action: 'BUY NO' },
+            marketInfo: 'Bundle: YES + NO < 100%'
+        });
+    });
+
+    // 2. Add cross-platform opportunities
+    const crossOpps = cp.cross_opportunities || [];
+    crossOpps.forEach(opp => {
+        add({
+            type: 'cross-platform',
+            title: opp.market_pair || opp.token || 'Cross-Platform Arb',
+            category: detectCategory(opp.market_pair || opp.token || ''),
+            edge: opp.edge_pct || 0,
+            platform1: { name: opp.buy_platform || 'Polymarket', price: opp.buy_price || 0, action: 'BUY' },
+            platform2: { name: opp.sell_platform || 'Kalshi', price: opp.sell_price || 0, action: 'SELL' },
+            marketInfo: `${opp.buy_platform} vs ${opp.sell_platform}`
+        });
+    });
+
+    // 3. Add matched pairs as potential opportunities (the server keeps
+    // only the best high-similarity matches, best first)
+    const bestMatches = cp.matched_pairs_top || [];
+    bestMatches.forEach(pair => {
+        add({
+            type: 'matched',
+            title: pair.poly_question || pair.kalshi_title || 'Matched Market',
+            category: detectCategory(pair.poly_question || pair.kalshi_title || ''),
+            edge: 0, // No arb found yet
+            similarity: pair.similarity || 0,
+            platform1: { name: 'Polymarket', price: pair.poly_yes || 0, action: 'Market' },
+            platform2: { name: 'Kalshi', price: pair.kalshi_yes || 0, action: 'Market' },
+            marketInfo: `Match: ${((pair.similarity || 0) * 100).toFixed(0)}% similar`
+        });
+    });
+
+    // Update count
+    setText(oppCount, arbCount > 0 ? `${arbCount} ARB found!` : `${allOpportunities.length} matches`);
+
+    // Highest edge first; only the cards shown are ever ordered
+    setVirtualItems(feedVList, topK(allOpportunities, 15, o => o.edge || 0));
+}
+
+// The k items with the largest key, largest first, in O(n log k) via a
+// size-k min-heap. Ties keep their input order, like a stable sort.
+function topK(items, k, keyOf) {
+    const heap = [];
+    const worse = (a, b) => a.key < b.key || (a.key === b.key && a.i > b.i);
+    const swap = (x, y) => { [heap[x], heap[y]] = [heap[y], heap[x]]; };
+
+    function siftUp(n) {
+        while (n > 0) {
+            const parent = (n - 1) >> 1;
+            if (!worse(heap[n], heap[parent])) return;
+            swap(n, parent);
+            n = parent;
+        }
+    }
+
+    function siftDown(n) {
+        for (;;) {
+            const left = 2 * n + 1;
+            let min = n;
+            if (left < heap.length && worse(heap[left], heap[min])) min = left;
+            if (left + 1 < heap.length && worse(heap[left + 1], heap[min])) min = left + 1;
+            if (min === n) return;
+            swap(n, min);
+            n = min;
+        }
+    }
+
+    items.forEach((item, i) => {
+        const entry = { item, key: keyOf(item), i };
+        if (heap.length < k) {
+            heap.push(entry);
+            siftUp(heap.length - 1);
+        } else if (k > 0 && worse(heap[0], entry)) {
+            heap[0] = entry;
+            siftDown(0);
+        }
+    });
+    return heap.sort((a, b) => b.key - a.key || a.i - b.i).map(entry => entry.item);
+}
+
+// Badge colour per detectCategory() result; categories without one get none
+const BADGE_CLASSES = { NFL: 'nfl', NBA: 'nba', Politics: 'politics', Crypto: 'crypto' };
+
+function getBadgeClass(category) {
+    return BADGE_CLASSES[category] || '';
+}
+
+// First match wins; one alternation per category instead of an includes() chain
+const CATEGORY_PATTERNS = [
+    [/nfl|football|bears|chiefs|packers/i, 'NFL'],
+    [/nba|basketball|lakers|celtics/i, 'NBA'],
+    [/trump|biden|election|president/i, 'Politics'],
+    [/bitcoin|btc|ethereum|crypto/i, 'Crypto'],
+    [/fed|rate|inflation/i, 'Finance'],
+];
+
+// Questions are re-categorized on every render, so results are cached per text
+const detectCategory = memoizeFormatter(text => {
+    for (const [pattern, category] of CATEGORY_PATTERNS) {
+        if (pattern.test(text)) return category;
+    }
+    return 'Other';
+});
+
+// Prices repeat exactly across ticks, so the raw value is the cache key
+const formatPct = memoizeFormatter(val => {
+    if (val === undefined || val === null) return '??%';
+    return (val * 100).toFixed(0) + '%';
+});
+
+function truncate(str, len) {
+    if (!str) return '';
+    return str.length > len ? str.substring(0, len) + '...' : str;
+}
+
+// One row item per market id, rebuilt only when markets are added or
+// removed (or the whole section is replaced); price patches reuse it and
+// rows read the current entry from state.markets when they render
+let marketItemsCache = null;
+
+function marketItems(markets) {
+    if (!marketItemsCache || marketItemsCache.markets !== markets) {
+        marketItemsCache = { markets, items: Object.keys(markets).map(id => ({ id })) };
+    }
+    return marketItemsCache.items;
+}
+
+function updateMarkets() {
+    const markets = state.markets || {};
+    const items = marketItems(markets);
+    const cp = state.cross_platform || {};
+
+    // Show cross-platform matched pairs if available
+    const matchedPairs = cp.matched_pairs_data || [];
+
+    // If we have matched pairs from cross-platform, show those
+    if (matchedPairs.length > 0) {
+        setVirtualItems(marketVList, matchedPairs.map(pair => ({ pair })));
+        return;
+    }
+
+    // Show Polymarket markets if available
+    if (items.length === 0) {
+        const polyCount = cp.polymarket_markets || 0;
+        const kalshiCount = cp.kalshi_markets || 0;
+
+        if (polyCount > 0 || kalshiCount > 0) {
+            setVirtualItems(marketVList, [], `
+                <div class="empty-state">
+                    <div class="empty-icon">🔄</div>
+                    <div>Loading orderbooks...</div>
+                    <div style="font-size: 0.75rem; color: var(--text-muted); margin-top: 0.5rem;">
+                        ${formatCount(polyCount)} Polymarket + ${formatCount(kalshiCount)} Kalshi markets
+                    </div>
+                </div>
+            `);
+        } else {
+            setVirtualItems(marketVList, [], '<div class="empty-state"><div class="empty-icon">📈</div><div>Loading markets...</div></div>');
+        }
+        return;
+    }
+
+    setVirtualItems(marketVList, items);
+}
+
+const formatCents = memoizeFormatter(cents => {
+    const sign = cents >= 0 ? '' : '-';
+    return `${sign}$${(Math.abs(cents) / 100).toFixed(2)}`;
+});
+
+function formatCurrency(value) {
+    // Quantize to cents so float noise does not defeat the cache
+    return formatCents(Math.round(value * 100));
+}
+
+const formatTenthsPct = memoizeFormatter(tenths => `${(tenths / 10).toFixed(1)}%`);
+
+function formatPct1(value) {
+    // One-decimal percentages (win rate, drawdown), quantized like formatCurrency
+    return formatTenthsPct(Math.round(value * 10));
+}
+
+// Same output as toLocaleTimeString(), without resolving the locale per call
+const CLOCK_FORMAT = new Intl.DateTimeFormat(undefined, { timeStyle: 'medium' });
+
+// Accepts epoch milliseconds (cheap) or an ISO string (parsed)
+function formatClock(timestamp) {
+    if (!timestamp) return '';
+    return CLOCK_FORMAT.format(typeof timestamp === 'number' ? timestamp : new Date(timestamp));
+}
+
+// Row timestamps repeat on every render; last_update is new each tick and
+// goes through formatClock directly so it doesn't churn the cache
+const formatTime = memoizeFormatter(formatClock);
+
+// Same caps as the server's display tails, so pushes between full
+// updates cannot grow client state without bound
+const MAX_OPPORTUNITIES = 50;
+const MAX_SIGNALS = 50;
+
+function pushCapped(list, item, limit) {
+    list.push(item);
+    if (list.length > limit) list.splice(0, list.length - limit);
+}
+
+function addOpportunity(opp) {
+    if (!state.opportunities) state.opportunities = [];
+    pushCapped(state.opportunities, opp, MAX_OPPORTUNITIES);
+    markDirty('opportunities');
+}
+
+function addActivity(activity) {
+    if (!state.signals) state.signals = [];
+    pushCapped(state.signals, activity, MAX_SIGNALS);
+    markDirty('signals');
+}
+
+// Ping to keep connection alive (the server also sends every client a
+// heartbeat every 30s from one shared task, so this only needs to beat
+// proxy idle timeouts on the client-to-server direction)
+setInterval(() => {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({type: 'ping'}));
+    }
+}, 45000);
+
+// Fetch initial state via REST as backup
+let stateEtag = null;
+
+async function fetchState() {
+    try {
+        const response = await fetch(authUrl('/api/state'),
+            stateEtag ? { headers: { 'If-None-Match': stateEtag } } : {});
+        if (response.status === 304) return;  // unchanged since the last poll
+        stateEtag = response.headers.get('ETag');
+        state = await response.json();
+        // Polled state is ahead of any frame we saw: replaying onto it
+        // would duplicate feed items, so the next connect starts fresh
+        if (!ws || ws.readyState !== WebSocket.OPEN) resumeFrom = null;
+        markAllDirty();
+        scheduleUpdate();
+    } catch (e) {
+        console.error('Failed to fetch state:', e);
+    }
+}
+
+// Initial load
+connect();
+fetchState();
+
+// REST fallback only while the WebSocket is down; when it is open the
+// server already pushes every change
+setInterval(() => {
+    if (!ws || ws.readyState !== WebSocket.OPEN) fetchState();
+}, 5000);
@@ -76,6 +76,7 @@ class TradingBot:
             gamma_url=self.config.api.gamma_api_url,
             api_key=self.config.api.api_key,
             api_secret=self.config.api.api_secret,
+            passphrase=self.config.api.passphrase,
             private_key=self.config.api.private_key,
             timeout=self.config.api.timeout_seconds,
             max_retries=self.config.api.max_retries,
@@ -220,19 +221,21 @@ class TradingBot:
         """Simulate order fills in dry run mode."""
         import random
         
+        draw = random.random
+        fill_probability = self.config.mode.fill_probability
+        
         while self._running:
             try:
                 await asyncio.sleep(2.0)  # Check every 2 seconds
                 
-                # Get open orders
+                # Get open orders and pick this tick's fills (random chance each)
                 orders = self.execution_engine.get_open_orders()
+                filled = [order for order in orders if draw() < fill_probability]
                 
-                for order in orders:
-                    # Random chance of fill
-                    if random.random() < self.config.mode.fill_probability:
-                        trade = self.client.simulate_fill(order.order_id)
-                        if trade:
-                            self.execution_engine.handle_fill(trade)
+                for order in filled:
+                    trade = self.client.simulate_fill(order.order_id)
+                    if trade:
+                        self.execution_engine.handle_fill(trade)
                             
             except asyncio.CancelledError:
                 break
@@ -23,6 +23,11 @@ from datetime import datetime
 
 import uvicorn
 
+try:
+    import uvloop  # Optional: faster event loop for the bot and dashboard
+except ImportError:
+    uvloop = None
+
 from polymarket_client import PolymarketClient
 from kalshi_client import KalshiClient
 from core.data_feed import DataFeed
@@ -87,8 +92,12 @@ class TradingBotWithDashboard:
             ws_url=self.config.api.polymarket_ws_url,
             gamma_url=self.config.api.gamma_api_url,
             api_key=self.config.api.api_key,
+            api_secret=self.config.api.api_secret,
+            passphrase=self.config.api.passphrase,
             private_key=self.config.api.private_key,
             timeout=self.config.api.timeout_seconds,
+            max_retries=self.config.api.max_retries,
+            retry_delay=self.config.api.retry_delay_seconds,
             dry_run=self.config.is_dry_run,
         )
         await self.client.connect()
@@ -197,6 +206,17 @@ class TradingBotWithDashboard:
             port=self.port,
             log_level="warning",
             access_log=False,
+            # The server shares the bot's already-running loop (uvloop when
+            # installed, see main()); http="auto" picks httptools if present.
+            http="auto",
+            # Deliberately off, replacing the earlier explicit deflate=True.
+            # Large dashboard frames are gzipped once per broadcast at the
+            # application level (?compress=gzip, see DashboardState._send_all).
+            # permessage-deflate would compress every frame again for each
+            # connection, gzip output included, and keep a compression window
+            # per client. Frames under WS_GZIP_MIN_BYTES (patches, pings) and
+            # clients without DecompressionStream go out uncompressed.
+            ws_per_message_deflate=False,
         )
         self._server = uvicorn.Server(config)
         self._server_task = asyncio.create_task(self._server.serve())
@@ -235,22 +255,25 @@ class TradingBotWithDashboard:
         """Simulate order fills in dry run mode."""
         import random
         
+        draw = random.random
+        fill_probability = self.config.mode.fill_probability
+        
         while self._running:
             try:
                 await asyncio.sleep(2.0)
                 
                 orders = self.execution_engine.get_open_orders()
-                for order in orders:
-                    if random.random() < self.config.mode.fill_probability:
-                        trade = self.client.simulate_fill(order.order_id)
-                        if trade:
-                            self.execution_engine.handle_fill(trade)
-                            self.dashboard_integration.add_trade(
-                                side=trade.side.value,
-                                price=trade.price,
-                                size=trade.size,
-                                market_id=trade.market_id,
-                            )
+                filled = [order for order in orders if draw() < fill_probability]
+                for order in filled:
+                    trade = self.client.simulate_fill(order.order_id)
+                    if trade:
+                        self.execution_engine.handle_fill(trade)
+                        self.dashboard_integration.add_trade(
+                            side=trade.side.value,
+                            price=trade.price,
+                            size=trade.size,
+                            market_id=trade.market_id,
+                        )
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -349,7 +372,7 @@ class TradingBotWithDashboard:
                                     "similarity": pair.similarity_score,
                                     "category": pair.category,
                                 })
-                            dashboard_state.cross_platform["matched_pairs_data"] = display_data
+                            dashboard_state.set_matched_pairs(display_data)
                     
                     result = new_loop.run_until_complete(
                         self.market_matcher.find_matches(
@@ -380,7 +403,7 @@ class TradingBotWithDashboard:
                     "category": pair.category,
                 })
             
-            dashboard_state.cross_platform["matched_pairs_data"] = matched_pairs_display
+            dashboard_state.set_matched_pairs(matched_pairs_display)
             
         except Exception as e:
             logger.error(f"Matching error: {e}")
@@ -533,8 +556,9 @@ def main() -> None:
     setup_logging(console_level=log_level)
     
     # Run
+    run = uvloop.run if uvloop is not None else asyncio.run
     try:
-        asyncio.run(main_async(args))
+        run(main_async(args))
     except KeyboardInterrupt:
         print("\nShutdown complete.")
 
@@ -58,6 +58,7 @@ async def test_connection(config_path: str = "config.live.yaml"):
         gamma_url=config.api.gamma_api_url,
         api_key=config.api.api_key,
         api_secret=config.api.api_secret,
+        passphrase=config.api.passphrase,
         private_key=config.api.private_key,
         timeout=config.api.timeout_seconds,
         dry_run=config.is_dry_run,
@@ -79,6 +79,17 @@ def create_market_state(order_book: OrderBook) -> MarketState:
     )
 
 
+class FeeSpyConfig(ArbConfig):
+    """ArbConfig that records whether the taker fee was read."""
+    
+    fee_reads = 0
+    
+    def __getattribute__(self, name):
+        if name == "taker_fee_bps":
+            object.__setattr__(self, "fee_reads", object.__getattribute__(self, "fee_reads") + 1)
+        return object.__getattribute__(self, name)
+
+
 class TestBundleArbitrage:
     """Tests for bundle arbitrage detection."""
     
@@ -161,6 +172,43 @@ class TestBundleArbitrage:
         
         bundle_signals = [s for s in signals if s.opportunity and s.opportunity.is_bundle_arb]
         assert len(bundle_signals) == 0
+    
+    def test_no_gross_edge_skips_fee_math(self):
+        """Test a bundle without gross edge is rejected before fees are computed."""
+        config = FeeSpyConfig(min_edge=0.01, taker_fee_bps=100)
+        engine = ArbEngine(config)
+        order_book = create_order_book(
+            market_id="test_market",
+            yes_bid=0.48,
+            yes_ask=0.50,
+            no_bid=0.48,
+            no_ask=0.50,
+        )
+        
+        assert engine._check_bundle_arbitrage("test_market", order_book) is None
+        assert config.fee_reads == 0
+    
+    def test_gross_edge_above_threshold_reaches_fee_check(self):
+        """Test a gross edge just above min_edge is still checked net of fees."""
+        # Total ask = 0.985 -> 1.5% gross edge, 1% taker fee leaves ~0.5% net
+        config = FeeSpyConfig(min_edge=0.01, taker_fee_bps=100, gas_cost_per_order=0)
+        engine = ArbEngine(config)
+        order_book = create_order_book(
+            market_id="test_market",
+            yes_bid=0.47,
+            yes_ask=0.49,
+            no_bid=0.48,
+            no_ask=0.495,
+        )
+        
+        assert engine._check_bundle_arbitrage("test_market", order_book) is None
+        assert config.fee_reads == 1
+        
+        # Without the fee the same book is an opportunity
+        engine.config = ArbConfig(min_edge=0.01, taker_fee_bps=0, gas_cost_per_order=0)
+        signal = engine._check_bundle_arbitrage("test_market", order_book)
+        assert signal is not None
+        assert signal.opportunity.opportunity_type == OpportunityType.BUNDLE_LONG
 
 
 class TestMarketMaking:
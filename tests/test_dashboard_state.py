@@ -0,0 +1,535 @@
+"""
+Tests for the Dashboard State
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from dashboard.server import BROADCAST_BATCH_WINDOW, DashboardState, _accepted_encodings, _dumps
+
+
+@pytest.fixture
+def state() -> DashboardState:
+    """Create a fresh dashboard state for tests."""
+    return DashboardState()
+
+
+class TestRecentTails:
+    """Tests for the capped display tails used by to_dict()."""
+
+    def test_opportunities_tail_capped(self, state: DashboardState):
+        """Test only the last 50 opportunities are exposed."""
+        for i in range(120):
+            state.add_opportunity({"market_id": f"m{i}", "edge": 0.01})
+
+        data = state.to_dict()
+        assert len(data["opportunities"]) == 50
+        assert data["opportunities"][0]["market_id"] == "m70"
+        assert data["opportunities"][-1]["market_id"] == "m119"
+
+    def test_trades_tail_capped(self, state: DashboardState):
+        """Test only the last 100 trades are exposed."""
+        for i in range(150):
+            state.add_trade({"side": "BUY", "price": 0.5, "size": float(i)})
+
+        data = state.to_dict()
+        assert len(data["trades"]) == 100
+        assert data["trades"][-1]["size"] == 149.0
+
+    def test_signals_history_is_the_tail(self, state: DashboardState):
+        """Test the stored signal history is itself capped, not just the view."""
+        for i in range(260):
+            state.add_signal({"action": "place", "market_id": f"m{i}"})
+
+        assert len(state.signals) == 50
+        assert state.to_dict()["signals"] is state.signals
+        assert state.signals[0]["market_id"] == "m210"
+
+    def test_items_stamped_with_epoch_ms(self, state: DashboardState):
+        """Test added items carry epoch milliseconds next to the ISO timestamp."""
+        before = time.time() * 1000
+        state.add_signal({"action": "place"})
+        signal = state.signals[-1]
+
+        assert before - 1 <= signal["timestamp_ms"] <= time.time() * 1000 + 1
+        assert datetime.fromisoformat(signal["timestamp"])
+
+    def test_cross_platform_opportunities_capped(self, state: DashboardState):
+        """Test cross-platform opportunities keep the last 50 and serialize."""
+        for i in range(80):
+            state.add_cross_platform_opportunity({"pair": f"p{i}"})
+
+        body = json.loads(state.state_snapshot()[0])
+        cross = body["cross_platform"]["cross_opportunities"]
+        assert len(cross) == 50
+        assert cross[0]["pair"] == "p30"
+
+
+class TestMatchedPairsTop:
+    """Tests for the best-match selection shown in the opportunities feed."""
+
+    def test_matched_pairs_top_is_best_similar_first(self, state: DashboardState):
+        """Test the top 20 matches are kept, highest similarity first."""
+        pairs = [{"poly_question": f"q{i}", "similarity": i / 100} for i in range(100)]
+        state.update_cross_platform_stats(10, 10, 100, matched_pairs_data=pairs)
+
+        top = state.cross_platform["matched_pairs_top"]
+        assert state.cross_platform["matched_pairs_data"] is pairs
+        assert [p["poly_question"] for p in top] == [f"q{i}" for i in range(99, 79, -1)]
+
+    def test_matched_pairs_top_drops_weak_matches(self, state: DashboardState):
+        """Test matches below the similarity threshold are left out."""
+        state.set_matched_pairs([{"similarity": 0.59}, {"similarity": 0.6}, {}])
+
+        assert state.cross_platform["matched_pairs_top"] == [{"similarity": 0.6}]
+
+
+class FakeWebSocket:
+    """Records frames sent by the broadcaster."""
+
+    def __init__(self):
+        self.sent: list = []
+
+    async def send_text(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    async def send_bytes(self, message: bytes) -> None:
+        # JSON frames are decoded; MessagePack frames are kept raw
+        self.sent.append(json.loads(message) if message[:1] == b"{" else message)
+
+
+class StuckWebSocket(FakeWebSocket):
+    """A client that never finishes reading a frame."""
+
+    async def send_bytes(self, message: bytes) -> None:
+        await asyncio.sleep(10)
+
+
+def frames(batch: list) -> list:
+    """Encode messages the way broadcast() queues them."""
+    return [(msg["type"], _dumps(msg)) for msg in batch]
+
+
+async def drain(state: DashboardState) -> None:
+    """Wait until every writer has sent (or given up on) the frames queued so far."""
+    for queue, task in list(state._writers.values()):
+        sent = asyncio.ensure_future(queue.join())
+        await asyncio.wait([sent, task], return_when=asyncio.FIRST_COMPLETED)
+        sent.cancel()
+
+
+async def deliver(state: DashboardState, payload: dict) -> None:
+    """Queue a payload for all clients and wait for the writers to send it."""
+    state._send_all(_dumps(payload))
+    await drain(state)
+
+
+class TestBroadcastBatching:
+    """Tests for coalescing bursts of broadcasts into one frame."""
+
+    def test_single_message_sent_as_is(self):
+        """Test a lone message is not wrapped in a batch."""
+        msg = ("opportunity", b'{"type":"opportunity","data":{}}')
+        assert DashboardState._coalesce([msg]) is msg[1]
+
+    def test_only_last_update_kept(self):
+        """Test superseded full-state updates are dropped from a batch."""
+        batch = [
+            {"type": "update", "data": {"n": 1}},
+            {"type": "opportunity", "data": {"id": "a"}},
+            {"type": "update", "data": {"n": 2}},
+        ]
+        payload = json.loads(DashboardState._coalesce(frames(batch)))
+
+        assert payload["type"] == "batch"
+        assert payload["items"] == batch[1:]
+
+    def test_burst_delivered_as_one_frame(self, state: DashboardState):
+        """Test messages queued in the same window share a frame."""
+        ws = FakeWebSocket()
+        state._connections.add(ws)
+
+        async def run():
+            for i in range(3):
+                await state.broadcast({"type": "activity", "data": {"i": i}})
+            await asyncio.sleep(BROADCAST_BATCH_WINDOW * 5)
+            state._broadcaster_task.cancel()
+
+        asyncio.run(run())
+
+        assert len(ws.sent) == 1
+        assert [item["data"]["i"] for item in ws.sent[0]["items"]] == [0, 1, 2]
+
+    def test_state_frozen_when_queued(self, state: DashboardState):
+        """Test a queued update does not pick up items added in the window."""
+        ws = FakeWebSocket()
+        state._connections.add(ws)
+
+        async def run():
+            await state.broadcast_state()
+            state.add_opportunity({"market_id": "late"})
+            await state.broadcast({"type": "opportunity", "data": {"market_id": "late"}})
+            await asyncio.sleep(BROADCAST_BATCH_WINDOW * 5)
+            state._broadcaster_task.cancel()
+
+        asyncio.run(run())
+
+        update, opportunity = ws.sent[0]["items"]
+        assert update["data"]["opportunities"] == []
+        assert opportunity["data"]["market_id"] == "late"
+
+    def test_update_drops_earlier_patches(self):
+        """Test patches queued before a full update are superseded by it."""
+        batch = [
+            {"type": "patch", "ops": []},
+            {"type": "update", "data": {"n": 1}},
+            {"type": "patch", "ops": []},
+        ]
+        payload = json.loads(DashboardState._coalesce(frames(batch)))
+
+        assert payload["items"] == batch[1:]
+
+    def test_binary_clients_get_msgpack(self, state: DashboardState):
+        """Test clients that negotiated MessagePack receive binary frames."""
+        msgpack = pytest.importorskip("msgpack")
+        text_ws, binary_ws = FakeWebSocket(), FakeWebSocket()
+        state._connections.update([text_ws, binary_ws])
+        assert state.enable_binary(binary_ws)
+
+        asyncio.run(deliver(state, {"type": "pong"}))
+
+        assert text_ws.sent == [{"type": "pong"}]
+        assert msgpack.unpackb(binary_ws.sent[0]) == {"type": "pong"}
+
+    def test_binary_initial_frame_is_full_state(self, state: DashboardState):
+        """Test a MessagePack client's initial frame unpacks into the full state."""
+        msgpack = pytest.importorskip("msgpack")
+        ws = FakeWebSocket()
+        state._connections.add(ws)
+        assert state.enable_binary(ws)
+        state.add_cross_platform_opportunity({"pair": "p0"})
+
+        async def run():
+            state.send_initial(ws)
+            await drain(state)
+
+        asyncio.run(run())
+
+        initial = msgpack.unpackb(ws.sent[0])
+        expected = json.loads(state.state_snapshot()[0])
+        assert initial["type"] == "initial"
+        assert initial["data"].keys() == expected.keys()
+        assert {**initial["data"], "uptime_seconds": 0} == {**expected, "uptime_seconds": 0}
+        assert initial["data"]["cross_platform"]["cross_opportunities"][0]["pair"] == "p0"
+
+    def test_gzip_clients_share_one_compressed_frame(self, state: DashboardState):
+        """Test large frames are gzipped once for all gzip clients."""
+        clients = [FakeWebSocket() for _ in range(3)]
+        plain = FakeWebSocket()
+        state._connections.update(clients + [plain])
+        for ws in clients:
+            state.enable_gzip(ws)
+        big = {"type": "update", "data": {"blob": "x" * 5000}}
+
+        async def run():
+            await deliver(state, big)
+            await deliver(state, {"type": "pong"})
+
+        asyncio.run(run())
+
+        frames = [ws.sent[0] for ws in clients]
+        assert all(frame is frames[0] for frame in frames)
+        assert json.loads(gzip.decompress(frames[0])) == big
+        assert clients[0].sent[1] == {"type": "pong"}
+        assert plain.sent == [big, {"type": "pong"}]
+
+    def test_slow_client_dropped_without_blocking_others(self, state: DashboardState, monkeypatch):
+        """Test a client that never finishes a send is dropped after the timeout."""
+        monkeypatch.setattr("dashboard.server.WS_SEND_TIMEOUT", 0.05)
+
+        stuck, ok = StuckWebSocket(), FakeWebSocket()
+        state._connections.update([stuck, ok])
+
+        async def run():
+            await deliver(state, {"type": "pong"})
+            await asyncio.sleep(0.1)
+
+        asyncio.run(run())
+
+        assert ok.sent == [{"type": "pong"}]
+        assert state._connections == {ok}
+
+    def test_backlogged_client_dropped_when_queue_full(self, state: DashboardState, monkeypatch):
+        """Test queuing never waits on a client whose queue has filled up."""
+        monkeypatch.setattr("dashboard.server.WS_SEND_QUEUE_SIZE", 2)
+
+        stuck, ok = StuckWebSocket(), FakeWebSocket()
+        state._connections.update([stuck, ok])
+
+        async def run():
+            for i in range(4):
+                state._send_all(_dumps({"type": "activity", "data": {"i": i}}))
+                await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+
+        assert [m["data"]["i"] for m in ok.sent] == [0, 1, 2, 3]
+        assert state._connections == {ok}
+        assert stuck not in state._writers
+
+    def test_disconnect_stops_writer(self, state: DashboardState):
+        """Test the writer task exits once its client disconnects."""
+        ws = FakeWebSocket()
+        state._connections.add(ws)
+
+        async def run():
+            await deliver(state, {"type": "pong"})
+            task = state._writers[ws][1]
+            state.disconnect(ws)
+            await asyncio.sleep(0.01)
+            return task.done()
+
+        assert asyncio.run(run())
+
+    def test_frames_delivered_to_every_client_in_order(self, state: DashboardState):
+        """Test each client's writer sends frames in the order queued."""
+        clients = [FakeWebSocket() for _ in range(40)]
+        state._connections.update(clients)
+
+        async def run():
+            state._send_all(_dumps({"type": "activity", "data": {"i": 0}}))
+            state._send_all(_dumps({"type": "activity", "data": {"i": 1}}))
+            await drain(state)
+
+        asyncio.run(run())
+
+        assert all([m["data"]["i"] for m in ws.sent] == [0, 1] for ws in clients)
+
+    def test_shared_heartbeat_reaches_clients_and_stops(self, state: DashboardState, monkeypatch):
+        """Test one heartbeat task serves all clients and exits when they leave."""
+        monkeypatch.setattr("dashboard.server.WS_HEARTBEAT_INTERVAL", 0.01)
+        clients = [FakeWebSocket() for _ in range(3)]
+        state._connections.update(clients)
+
+        async def run():
+            state.start_heartbeat()
+            await asyncio.sleep(0.035)
+            for ws in clients:
+                state.disconnect(ws)
+            await asyncio.sleep(0.03)
+            return state._heartbeat_task.done()
+
+        assert asyncio.run(run())
+        assert all(ws.sent and ws.sent[0] == {"type": "heartbeat"} for ws in clients)
+
+
+class TestResume:
+    """Tests for reconnecting clients resuming from the last frame they saw."""
+
+    @staticmethod
+    async def broadcast_each(state: DashboardState, start: int, stop: int) -> None:
+        """Broadcast activity messages i=start..stop-1, one frame each."""
+        for i in range(start, stop):
+            await state.broadcast({"type": "activity", "data": {"i": i}})
+            await asyncio.sleep(BROADCAST_BATCH_WINDOW * 3)
+
+    def test_frames_carry_sequence_numbers(self, state: DashboardState):
+        """Test each broadcast frame is numbered."""
+        ws = FakeWebSocket()
+        state._connections.add(ws)
+
+        async def run():
+            await self.broadcast_each(state, 0, 2)
+            state._broadcaster_task.cancel()
+
+        asyncio.run(run())
+
+        assert [frame["seq"] for frame in ws.sent] == [1, 2]
+
+    def test_reconnect_gets_only_missed_frames(self, state: DashboardState):
+        """Test a returning client is sent the frames after the one it saw, as one batch."""
+        ws, returning = FakeWebSocket(), FakeWebSocket()
+        state._connections.add(ws)
+
+        async def run():
+            await self.broadcast_each(state, 0, 3)
+            state._connections.add(returning)
+            resumed = state.resume(returning, state.session_id, "1")
+            await asyncio.sleep(0.01)
+            state._broadcaster_task.cancel()
+            return resumed
+
+        assert asyncio.run(run())
+        (frame,) = returning.sent
+        assert frame["seq"] == 3
+        assert [item["data"]["i"] for item in frame["items"]] == [1, 2]
+
+    def test_resume_refused_outside_buffer(self, state: DashboardState):
+        """Test other sessions, bad cursors and evicted frames fall back to a snapshot."""
+        state._seq = 5
+        state._replay.extend([[("activity", b'{"type":"activity"}')]] * 2)
+        ws = FakeWebSocket()
+
+        assert not state.resume(ws, "another-process", "4")
+        assert not state.resume(ws, state.session_id, "nope")
+        assert not state.resume(ws, state.session_id, "2")
+        assert not state.resume(ws, state.session_id, "6")
+        assert state.resume(ws, state.session_id, "5")
+
+    def test_skipped_broadcast_blocks_resume(self, state: DashboardState, monkeypatch):
+        """Test frames dropped while nobody was listening make resuming impossible."""
+        monkeypatch.setattr("dashboard.server.WS_RESUME_GRACE", 0)
+        ws = FakeWebSocket()
+        state._connections.add(ws)
+        state.disconnect(ws)
+
+        asyncio.run(state.broadcast({"type": "activity", "data": {}}))
+
+        assert not state.resume(FakeWebSocket(), state.session_id, "0")
+
+
+class TestStatePatches:
+    """Tests for periodic updates sent as patches against the last broadcast."""
+
+    @staticmethod
+    def paths(message: dict) -> dict:
+        return {op["path"]: op for op in message["ops"] if op["path"] != "/uptime_seconds"}
+
+    def test_first_message_is_full_state(self, state: DashboardState):
+        """Test the first periodic update carries the whole state."""
+        message = state._next_state_message()
+
+        assert message["type"] == "update"
+        assert "markets" in message["data"]
+
+    def test_changed_values_become_replace_ops(self, state: DashboardState):
+        """Test only the changed keys of a section are sent."""
+        state.markets = {"m1": {"bid": 0.4}, "m2": {"bid": 0.5}}
+        state._next_state_message()
+
+        state.markets = {**state.markets, "m2": {"bid": 0.55}}
+        ops = self.paths(state._next_state_message())
+
+        assert "/markets/m1" not in ops
+        assert ops["/markets/m2"] == {"op": "replace", "path": "/markets/m2", "value": {"bid": 0.55}}
+
+    def test_removed_keys_become_remove_ops(self, state: DashboardState):
+        """Test keys dropped from a section are removed on the client."""
+        state.markets = {"a/b": {"bid": 0.4}}
+        state._next_state_message()
+
+        state.markets = {}
+        ops = self.paths(state._next_state_message())
+
+        assert ops["/markets/a~1b"]["op"] == "remove"
+
+    def test_in_place_change_needs_mark_dirty(self, state: DashboardState):
+        """Test sections mutated in place are only re-checked once marked."""
+        state.portfolio = {"total_pnl": 0.0}
+        state._next_state_message()
+
+        state.portfolio["total_pnl"] = 5.0
+        message = state._next_state_message()
+        assert "/portfolio/total_pnl" not in self.paths(message or {"ops": []})
+
+        state.mark_dirty("portfolio")
+        ops = self.paths(state._next_state_message())
+        assert ops["/portfolio/total_pnl"]["value"] == 5.0
+
+    def test_added_items_mark_their_section(self, state: DashboardState):
+        """Test add_* methods flag the capped histories they append to."""
+        state._next_state_message()
+
+        state.add_trade({"side": "BUY", "price": 0.5, "size": 1.0})
+        ops = self.paths(state._next_state_message())
+
+        assert set(ops) == {"/trades"}
+
+    def test_reset_forces_full_state(self, state: DashboardState):
+        """Test a reset (e.g. on new connection) resends the full state."""
+        state._next_state_message()
+        state.reset_state_patches()
+
+        assert state._next_state_message()["type"] == "update"
+
+
+class TestStateSnapshot:
+    """Tests for the cached /api/state body and its ETag."""
+
+    @pytest.fixture(autouse=True)
+    def no_snapshot_cache(self, monkeypatch):
+        monkeypatch.setattr("dashboard.server.STATE_SNAPSHOT_TTL", 0)
+
+    def test_body_is_full_state(self, state: DashboardState):
+        """Test the body parses to the same keys as to_dict()."""
+        body, _ = state.state_snapshot()
+
+        assert json.loads(body).keys() == state.to_dict().keys()
+
+    def test_etag_ignores_uptime(self, state: DashboardState):
+        """Test the ETag is stable while only uptime changes."""
+        first_body, first = state.state_snapshot()
+        time.sleep(0.01)
+        second_body, second = state.state_snapshot()
+
+        assert json.loads(first_body)["uptime_seconds"] < json.loads(second_body)["uptime_seconds"]
+        assert first == second
+
+    def test_etag_changes_with_state(self, state: DashboardState):
+        """Test the ETag changes when the state does."""
+        _, before = state.state_snapshot()
+        state.portfolio = {"total_pnl": 1.0}
+        _, after = state.state_snapshot()
+
+        assert before != after
+
+    def test_snapshot_reused_until_last_update_moves(self, state: DashboardState, monkeypatch):
+        """Test the serialized state is cached per last_update."""
+        monkeypatch.setattr("dashboard.server.STATE_SNAPSHOT_TTL", 60)
+        _, before = state.state_snapshot()
+
+        state.portfolio = {"total_pnl": 1.0}
+        assert state.state_snapshot()[1] == before
+
+        state.last_update = datetime.utcnow()
+        assert state.state_snapshot()[1] != before
+
+    def test_initial_message_wraps_snapshot(self, state: DashboardState):
+        """Test a new JSON client receives the full state."""
+        ws = FakeWebSocket()
+
+        async def run():
+            state.send_initial(ws)
+            await drain(state)
+
+        asyncio.run(run())
+
+        assert ws.sent[0]["type"] == "initial"
+        assert ws.sent[0]["session"] == state.session_id
+        assert ws.sent[0]["seq"] == 0
+        assert ws.sent[0]["data"].keys() == state.to_dict().keys()
+
+
+class TestContentNegotiation:
+    """Tests for Accept-Encoding parsing of precompressed assets."""
+
+    def test_codings_listed_with_weights(self):
+        """Test listed codings are accepted and q=0 refuses one."""
+        assert _accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+        assert _accepted_encodings("gzip;q=1.0, br;q=0") == {"gzip"}
+        assert _accepted_encodings("br; q=0.000, gzip; q=0.5") == {"gzip"}
+
+    def test_no_substring_matches(self):
+        """Test codings are matched as whole tokens."""
+        assert _accepted_encodings("x-gzip-ish, brotli") == {"x-gzip-ish", "brotli"}
+        assert _accepted_encodings("") == set()
+
+    def test_wildcard_covers_unnamed_codings(self):
+        """Test * accepts codings the header does not refuse itself."""
+        assert {"br", "gzip"} <= _accepted_encodings("*")
+        assert "br" not in _accepted_encodings("*, br;q=0")